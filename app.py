@@ -1,199 +1,132 @@
-import streamlit as st
-import requests
-import yfinance as yf
-from datetime import datetime, timedelta
-import pandas as pd
+import json
+import os
 import time
-import re
-from textblob import TextBlob
-from deep_translator import GoogleTranslator
+from contextlib import nullcontext
+
+import pandas as pd
+import streamlit as st
+
+# Só módulos leves no topo: o motor (yfinance, textblob, requests...) entra no primeiro scan
+from bdr_scanner.atualizador import Atualizador, ultimo_snapshot
+from bdr_scanner.cache import CacheSQLite
+from bdr_scanner.instrumentacao import Instrumentacao, perfil_cprofile
+from bdr_scanner.config import (ARQUIVO_PATH, BRAPI_TOKEN, CACHE_PATH, FINNHUB_KEY, LIMITES_PADRAO,
+                                RESULTADOS_PATH, SNAPSHOTS_PATH)
+from bdr_scanner.saida import carregar_resultados, resultados_para_df
 
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(page_title="Scanner Pro BDRs", page_icon="💹", layout="wide")
 
 # --- SEGREDOS ---
-FINNHUB_KEY = st.secrets.get("FINNHUB_API_KEY", "d4uouchr01qnm7pnasq0d4uouchr01qnm7pnasqg")
-BRAPI_TOKEN = st.secrets.get("BRAPI_API_TOKEN", "iExnKM1xcbQcYL3cNPhPQ3")
-
-# --- CLASSE MONITOR ---
-class SwingTradeMonitor:
-    def __init__(self):
-        # Instancia o tradutor
-        self.translator = GoogleTranslator(source='auto', target='pt')
-        self.ticker_map = self._carregar_mapa_bdr_us()
-        
-    def _carregar_mapa_bdr_us(self):
-        return {
-            'AAPL': 'AAPL34', 'MSFT': 'MSFT34', 'GOOGL': 'GOGL34', 'AMZN': 'AMZO34', 
-            'NVDA': 'NVDC34', 'TSLA': 'TSLA34', 'META': 'FBOK34', 'NFLX': 'NFLX34',
-            'AMD': 'A1MD34', 'INTC': 'ITLC34', 'JPM': 'JPMC34', 'BAC': 'BOAC34',
-            'WMT': 'WALM34', 'KO': 'COCA34', 'PEP': 'PEPB34', 'JNJ': 'JNJB34',
-            'DIS': 'DISB34', 'PFE': 'PFIZ34', 'XOM': 'EXXO34', 'CVX': 'CHVX34',
-            'PG': 'PGCO34', 'V': 'VISA34', 'MA': 'MSCD34', 'MCD': 'MCDC34',
-            'ABBV': 'ABBV34', 'MRK': 'MRCK34', 'CRM': 'SACM34', 'ORCL': 'ORCL34',
-            'AVGO': 'AVGO34', 'CSCO': 'CSCO34', 'ACN': 'ACNB34', 'ADBE': 'ADBE34',
-            'QCOM': 'QCOM34', 'TXN': 'TEXA34', 'HON': 'HONB34', 'UNH': 'UNHH34'
-        }
-
-    def traduzir(self, texto):
-        """Traduz texto para PT-BR com tratamento de erro"""
-        if not texto or len(texto) < 3: return ""
-        try:
-            return self.translator.translate(texto)
-        except:
-            return texto # Retorna original se falhar a API de tradução
-
-    def obter_bdrs_brapi(self, limite=50):
-        try:
-            url = f"https://brapi.dev/api/quote/list?token={BRAPI_TOKEN}"
-            r = requests.get(url, timeout=10)
-            data = r.json().get('stocks', [])
-            df = pd.DataFrame(data)
-            df = df[df['stock'].str.contains(r'(31|32|33|34|35|39)$')]
-            df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
-            return df.sort_values('volume', ascending=False).head(limite)['stock'].tolist()
-        except:
-            return list(self.ticker_map.values())
-
-    def converter_para_us(self, bdr):
-        bdr_clean = bdr.replace('.SA', '')
-        for us, br in self.ticker_map.items():
-            if br == bdr_clean: return us
-        return re.sub(r'\d+$', '', bdr_clean)
-
-    def get_yahoo_data(self, ticker_us):
-        try:
-            stock = yf.Ticker(ticker_us)
-            try: cal = stock.calendar; earn_date = cal.get('Earnings Date', [None])[0] if cal else None
-            except: earn_date = None
-            try: info = stock.info; ex_div = info.get('exDividendDate'); div_yield = info.get('dividendYield')
-            except: ex_div, div_yield = None, None
-            
-            hist = stock.history(period='1mo')
-            trend = "Lateral"
-            price = 0
-            if not hist.empty:
-                price = hist['Close'].iloc[-1]
-                sma20 = hist['Close'].mean()
-                trend = "Alta 📈" if price > sma20 else "Baixa 📉"
-            
-            return {'earnings': earn_date, 'ex_div': ex_div, 'yield': div_yield, 'trend': trend, 'price': price}
-        except: return None
-
-    def get_news(self, ticker_us):
-        try:
-            hj = datetime.now().strftime('%Y-%m-%d')
-            inicio = (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d')
-            url = f'https://finnhub.io/api/v1/company-news?symbol={ticker_us}&from={inicio}&to={hj}&token={FINNHUB_KEY}'
-            r = requests.get(url, timeout=5)
-            return r.json() if r.status_code == 200 else []
-        except: return []
-
-    def gerar_analise_compra(self, gatilho, score):
-        """Gera a explicação do porquê comprar"""
-        if "Balanço" in gatilho:
-            return "Alta volatilidade esperada. Oportunidade de captura de movimento forte pós-resultado."
-        elif "Data Com" in gatilho:
-            return "Entrada estratégica para garantir o recebimento de dividendos (Yield atraente)."
-        elif "Upgrade" in gatilho or "Buy" in gatilho:
-            return "Bancos e analistas revisaram a nota para cima, indicando fluxo comprador institucional."
-        elif "Record" in gatilho or "Growth" in gatilho:
-            return "Empresa reportando crescimento ou recordes, validando a tendência de alta."
-        elif "Approval" in gatilho:
-            return "Aprovação regulatória (ex: FDA) destrava valor fundamental na ação."
-        else:
-            return "Fluxo de notícias extremamente positivo sugere otimismo do mercado."
-
-    def analisar_ativo(self, bdr):
-        ticker_us = self.converter_para_us(bdr)
-        if not ticker_us: return None
-        
-        y_data = self.get_yahoo_data(ticker_us)
-        if not y_data: return None
-        
-        noticias = self.get_news(ticker_us)
-        
-        score = 0
-        eventos = []
-        manchete_top = ""
-        resumo_top = ""
-        fonte_top = ""
-        link_top = ""
-        gatilho_principal = ""
-        
-        # 1. Earnings (50 pts)
-        if y_data['earnings']:
-            dias = (pd.to_datetime(y_data['earnings']).replace(tzinfo=None) - datetime.now()).days
-            if 0 <= dias <= 15:
-                score += 50
-                gatilho_principal = "Balanço Próximo"
-                eventos.append(f"Balanço em {dias}d")
-        
-        # 2. Dividendos (30 pts)
-        if y_data['ex_div']:
-            dias = (datetime.fromtimestamp(y_data['ex_div']) - datetime.now()).days
-            if 0 <= dias <= 10:
-                score += 30
-                if not gatilho_principal: gatilho_principal = "Data Com (Dividendos)"
-                y_val = f"{(y_data['yield']*100):.1f}%" if y_data['yield'] else "?"
-                eventos.append(f"Div (Y: {y_val})")
-
-        # 3. Notícias (até 20 pts)
-        keyword_map = {
-            'upgrade': 'Upgrade de Analista', 'buy': 'Recomendação de Compra', 
-            'record': 'Recorde Histórico', 'growth': 'Crescimento', 
-            'approval': 'Aprovação Regulatória', 'soar': 'Disparada', 'jump': 'Salto'
-        }
-
-        for n in noticias[:15]:
-            texto = f"{n['headline']} {n['summary']}".lower()
-            
-            for k, v in keyword_map.items():
-                if k in texto:
-                    blob = TextBlob(texto)
-                    if blob.sentiment.polarity > 0.1:
-                        score += 5
-                        if not manchete_top:
-                            manchete_top = n['headline']
-                            resumo_top = n['summary']
-                            fonte_top = n.get('source', 'Finnhub')
-                            link_top = n['url']
-                            if not gatilho_principal: gatilho_principal = v
-            
-            if score >= 80: break
-
-        if score < 20: return None 
-
-        acao = "COMPRAR AGORA 🔴" if score >= 60 else "MONITORAR 🟠" if score >= 40 else "OBSERVAR 🟡"
-        
-        # Tradução Final
-        if manchete_top:
-            manchete_top = self.traduzir(manchete_top)
-            if resumo_top:
-                resumo_top = self.traduzir(resumo_top)
-        else:
-            manchete_top = "Movimento técnico/fundamental detectado"
-            resumo_top = "Nenhuma notícia específica recente, mas indicadores técnicos ou calendário apontam oportunidade."
-            fonte_top = "Análise Técnica"
-
-        analise_robo = self.gerar_analise_compra(gatilho_principal, score)
-
-        return {
-            "BDR": bdr,
-            "US": ticker_us,
-            "Preço": y_data['price'],
-            "Tendência": y_data['trend'],
-            "Score": min(score, 100),
-            "Ação": acao,
-            "Manchete": manchete_top,
-            "Resumo": resumo_top,
-            "Fonte": fonte_top,
-            "Link": link_top,
-            "Análise": analise_robo,
-            "Gatilho": gatilho_principal if gatilho_principal else "Fluxo Positivo"
-        }
+FINNHUB_KEY = st.secrets.get("FINNHUB_API_KEY", FINNHUB_KEY)
+BRAPI_TOKEN = st.secrets.get("BRAPI_API_TOKEN", BRAPI_TOKEN)
 
 # --- INTERFACE ---
+@st.cache_resource
+def obter_cache():
+    """Um cache por processo do servidor, compartilhado entre sessões"""
+    return CacheSQLite(CACHE_PATH)
+
+@st.cache_resource
+def obter_clientes():
+    """Clientes do motor criados uma vez por processo e divididos entre as sessões (todos
+    thread-safe): sessão HTTP, com o limite do Finnhub valendo para o servidor inteiro,
+    provedor com os tradutores e memo de sentimento"""
+    from bdr_scanner.noticias import MemoSentimento
+    from bdr_scanner.provedores import ProvedorAoVivo
+    from bdr_scanner.transporte import Transporte
+    http = Transporte()
+    return {'cache': obter_cache(), 'http': http, 'provedor': ProvedorAoVivo(http, FINNHUB_KEY, BRAPI_TOKEN),
+            'sentimento': MemoSentimento(obter_cache())}
+
+def criar_monitor(limites=None, instrumentacao=None):
+    """Monitor por scan (guarda o estado do scan) sobre os clientes compartilhados: sai barato"""
+    from bdr_scanner.monitor import SwingTradeMonitor
+    return SwingTradeMonitor(limites, instrumentacao=instrumentacao, **obter_clientes())
+
+@st.cache_resource
+def obter_arquivo():
+    """Histórico Parquet dos scans (para o backtest: python -m bdr_scanner backtest)"""
+    from bdr_scanner.arquivo import ArquivoScans
+    return ArquivoScans(ARQUIVO_PATH)
+
+@st.cache_resource
+def obter_atualizador():
+    """Um atualizador por processo do servidor: todas as sessões dividem os mesmos scans"""
+    return Atualizador(criar_monitor, SNAPSHOTS_PATH, arquivo=obter_arquivo()).iniciar()
+
+POR_PAGINA = 10  # cartões renderizados por vez: o resto fica nas outras páginas
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def ler_resultados(caminho, mtime):
+    """Resultados salvos lidos uma vez por versão do arquivo (o mtime entra na chave):
+    reruns da página (slider, paginação) não relêem o JSON"""
+    return carregar_resultados(caminho)
+
+def guardar_resultados(df, corte, origem):
+    """Resultado da sessão: sobrevive aos reruns e é só filtrado em memória depois"""
+    st.session_state['resultado'] = {'df': df, 'corte': corte, 'origem': origem}
+
+def mostrar_filtrado(df, min_score):
+    """Filtra em memória e renderiza; frame vazio (scan ou snapshot sem oportunidades) só avisa"""
+    df = df[df['Score'] >= min_score].reset_index(drop=True)
+    if len(df): renderizar_resultados(df)
+    else: st.warning("Nenhuma oportunidade encontrada.")
+
+def renderizar_cartao(row, expandido=False):
+    with st.expander(f"{row['BDR']} ({row['US']}) - {row['Ação']} (Score: {row['Score']})", expanded=expandido):
+        c1, c2 = st.columns([2, 1])
+
+        with c1:
+            st.markdown(f"**📢 Notícia:** {row['Manchete']}")
+            st.caption(f"Fonte: {row['Fonte']}")
+            st.info(f"**Resumo:** {row['Resumo']}")
+
+        with c2:
+            st.markdown(f"**🎯 Por que é compra?**")
+            st.write(f"_{row['Análise']}_")
+            st.metric("Tendência", row['Tendência'])
+            st.markdown(f"[Ler notícia original]({row['Link']})")
+
+def renderizar_resultados(df, parcial=False):
+    """Tabela + cartões. Com `parcial` (scan ainda rodando, redesenhado a cada resultado)
+    só a tabela; os cartões saem uma página por vez, ou só o da linha selecionada."""
+    if parcial: st.info(f"{len(df)} oportunidades até agora... (manchetes ainda sem tradução)")
+    else: st.success(f"{len(df)} Oportunidades encontradas!")
+    
+    # TABELA RESUMIDA
+    st.subheader("📋 Tabela Geral")
+    evento = st.dataframe(
+        df[['BDR', 'Preço', 'Score', 'Ação', 'Manchete', 'Fonte', 'Link']],
+        column_config={
+            "Link": st.column_config.LinkColumn("Ver", display_text="Original"),
+            "Score": st.column_config.ProgressColumn("Força", format="%d", min_value=0, max_value=100),
+            "Preço": st.column_config.NumberColumn("Preço ($)", format="$ %.2f"),
+            "Manchete": st.column_config.TextColumn("Última Notícia (Traduzida)", width="large"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        **({} if parcial else {'on_select': 'rerun', 'selection_mode': 'single-row'}),
+    )
+    if parcial: return
+    
+    # DETALHES EXPANDIDOS (CARTÕES)
+    st.markdown("---")
+    st.subheader("🕵️‍♂️ Detalhes das Oportunidades (Análise Profunda)")
+
+    selecionadas = [i for i in evento.selection.rows if i < len(df)]
+    if selecionadas:
+        renderizar_cartao(df.iloc[selecionadas[0]], expandido=True)
+        return
+
+    paginas = -(-len(df) // POR_PAGINA)
+    pagina = 1
+    if paginas > 1:
+        pagina = st.number_input(f"Página (de {paginas}) — ou selecione uma linha da tabela", 1, paginas, 1)
+    inicio = (pagina - 1) * POR_PAGINA
+    for index, row in enumerate(df.iloc[inicio:inicio + POR_PAGINA].to_dict('records'), start=inicio):
+        renderizar_cartao(row, expandido=(index < 2))
+
 st.title("🌐 Scanner BDR: Notícias & Oportunidades")
 st.markdown("### Monitoramento Fundamentalista em Tempo Real (PT-BR)")
 
@@ -201,68 +134,110 @@ with st.sidebar:
     st.header("Filtros")
     qtd = st.slider("Ativos para analisar:", 10, 60, 30)
     filtro_score = st.slider("Score Mínimo:", 0, 50, 20)
+    streaming = st.checkbox("Mostrar resultados conforme chegam", value=True)
+    incremental = st.checkbox("Reaproveitar ativos sem notícias novas", value=True,
+                              help="Rescan rápido: só reanalisa quem mudou desde o último scan")
+    with st.expander("Concorrência"):
+        paralelo = st.checkbox("Modo paralelo", value=True)
+        limites = {
+            'ativos': st.slider("Ativos simultâneos", 1, 16, LIMITES_PADRAO['ativos']),
+            'yahoo': st.slider("Chamadas Yahoo", 1, 16, LIMITES_PADRAO['yahoo']),
+            'finnhub': st.slider("Chamadas Finnhub", 1, 16, LIMITES_PADRAO['finnhub']),
+            'traducao': st.slider("Traduções", 1, 16, LIMITES_PADRAO['traducao']),
+        }
+    with st.expander("Diagnóstico"):
+        diagnostico = st.checkbox("Medir etapas do scan", value=False)
+        perfilar = st.checkbox("Perfil cProfile (roda em série)", value=False)
+    st.divider()
+    atualizador = obter_atualizador()
+    forcar = st.button("🔄 Forçar atualização", disabled=atualizador.rodando,
+                       help="Atualiza o snapshot em segundo plano (compartilhado entre as sessões)")
+    if os.path.exists(RESULTADOS_PATH):
+        st.divider()
+        idade_min = (time.time() - os.path.getmtime(RESULTADOS_PATH)) / 60
+        st.caption(f"Último scan salvo há {idade_min:.0f} min")
+        usar_salvo = st.button("📂 Abrir último scan salvo")
+    else:
+        usar_salvo = False
 
 if st.button("🚀 Iniciar Scanner", type="primary"):
-    monitor = SwingTradeMonitor()
-    status = st.empty()
-    bar = st.progress(0)
-    
-    status.info("Buscando lista de BDRs...")
-    bdrs = monitor.obter_bdrs_brapi(qtd)
+    monitor = criar_monitor(limites, Instrumentacao() if diagnostico else None)
+    if perfilar: paralelo = False  # o cProfile só enxerga a thread atual
+    with (perfil_cprofile() if perfilar else nullcontext({})) as perfil:
+        status = st.empty()
+        bar = st.progress(0)
     
-    resultados = []
+        status.info("Buscando lista de BDRs...")
+        bdrs = monitor.obter_bdrs_brapi(qtd)
     
-    for i, bdr in enumerate(bdrs):
-        bar.progress((i+1)/len(bdrs))
-        status.text(f"Analisando {bdr}... Traduzindo dados...")
-        try:
-            res = monitor.analisar_ativo(bdr)
-            if res and res['Score'] >= filtro_score:
-                resultados.append(res)
-        except: continue
+        if streaming:
+            area = st.empty()
+            resultados = []
+            for feitos, total, bdr, res in monitor.escanear_stream(bdrs, paralelo=paralelo, min_score=filtro_score,
+                                                                   incremental=incremental, arquivo=obter_arquivo()):
+                bar.progress(feitos / total)
+                status.text(f"Analisado {bdr} ({feitos}/{total})...")
+                if res and res['Score'] >= filtro_score:
+                    resultados.append(res)
+                    with area.container():
+                        renderizar_resultados(resultados_para_df(resultados), parcial=True)
+            status.text("Traduzindo manchetes...")
+            monitor.traduzir_resultados(resultados)
+            area.empty()
+        else:
+            def atualizar_progresso(feitos, total, bdr):
+                bar.progress(feitos / total)
+                status.text(f"Analisado {bdr} ({feitos}/{total})... Traduzindo dados...")
+
+            resultados = monitor.escanear(bdrs, progresso=atualizar_progresso, paralelo=paralelo,
+                                          min_score=filtro_score, incremental=incremental, arquivo=obter_arquivo())
             
-    bar.empty()
-    status.empty()
+        bar.empty()
+        status.empty()
     
-    if resultados:
-        df = pd.DataFrame(resultados)
-        df = df.sort_values(['Score'], ascending=False)
-        
-        st.success(f"{len(df)} Oportunidades encontradas!")
-        
-        # TABELA RESUMIDA
-        st.subheader("📋 Tabela Geral")
-        st.data_editor(
-            df[['BDR', 'Preço', 'Score', 'Ação', 'Manchete', 'Fonte', 'Link']],
-            column_config={
-                "Link": st.column_config.LinkColumn("Ver", display_text="Original"),
-                "Score": st.column_config.ProgressColumn("Força", format="%d", min_value=0, max_value=100),
-                "Preço": st.column_config.NumberColumn("Preço ($)", format="$ %.2f"),
-                "Manchete": st.column_config.TextColumn("Última Notícia (Traduzida)", width="large"),
-            },
-            hide_index=True,
-            use_container_width=True
-        )
-        
-        # DETALHES EXPANDIDOS (CARTÕES)
-        st.markdown("---")
-        st.subheader("🕵️‍♂️ Detalhes das Oportunidades (Análise Profunda)")
-        
-        for index, row in df.iterrows():
-            cor_card = "red" if "COMPRAR" in row['Ação'] else "orange" if "MONITORAR" in row['Ação'] else "blue"
-            
-            with st.expander(f"{row['BDR']} ({row['US']}) - {row['Ação']} (Score: {row['Score']})", expanded=(index < 2)):
-                c1, c2 = st.columns([2, 1])
-                
-                with c1:
-                    st.markdown(f"**📢 Notícia:** {row['Manchete']}")
-                    st.caption(f"Fonte: {row['Fonte']}")
-                    st.info(f"**Resumo:** {row['Resumo']}")
-                    
-                with c2:
-                    st.markdown(f"**🎯 Por que é compra?**")
-                    st.write(f"_{row['Análise']}_")
-                    st.metric("Tendência", row['Tendência'])
-                    st.markdown(f"[Ler notícia original]({row['Link']})")
+    with st.sidebar.expander("Cache e HTTP"):
+        st.json({'cache': monitor.cache.estatisticas(), 'http': monitor.http.estatisticas()})
+
+    if diagnostico or perfilar:
+        with st.expander("🩺 Diagnóstico do scan"):
+            relatorio = monitor.relatorio_desempenho()
+            if relatorio.get('etapas'):
+                st.caption(f"Scan em {relatorio['duracao_s']:.1f}s")
+                st.dataframe(pd.DataFrame(relatorio['etapas']).T, use_container_width=True)
+                st.json(relatorio['contadores'])
+            if perfilar: st.code(perfil['texto'])
+            st.download_button("Baixar relatório (JSON)", json.dumps(relatorio, ensure_ascii=False, indent=2),
+                               file_name="relatorio_scan.json", mime="application/json")
+    
+    guardar_resultados(resultados_para_df(resultados, filtro_score), filtro_score,
+                       f"Scan das {time.strftime('%H:%M')}")
+elif usar_salvo:
+    guardar_resultados(ler_resultados(RESULTADOS_PATH, os.path.getmtime(RESULTADOS_PATH)), 0, "Último scan salvo")
+elif forcar:
+    st.session_state.pop('resultado', None)  # volta para o snapshot
+
+resultado = st.session_state.get('resultado')
+if resultado:
+    # Resultado da sessão (scan ou arquivo aberto): o filtro de score só filtra em memória
+    c1, c2 = st.columns([4, 1])
+    c1.caption(resultado['origem'] + (f" — feito com score mínimo {resultado['corte']}; para ver abaixo disso, "
+                                      "rode o scanner de novo" if filtro_score < resultado['corte'] else ""))
+    if c2.button("Voltar ao snapshot"):
+        st.session_state.pop('resultado', None)
+        st.rerun()
+    mostrar_filtrado(resultado['df'], filtro_score)
+else:
+    # Sem resultado na sessão: mostra na hora o último snapshot do atualizador em segundo plano
+    if forcar:
+        with st.spinner("Atualizando em segundo plano..."):
+            atualizador.aguardar(atualizador.solicitar())
+        if atualizador.ultimo_erro: st.error(f"Falha na atualização: {atualizador.ultimo_erro}")
+    ultimo = ultimo_snapshot(SNAPSHOTS_PATH)
+    if ultimo is None:
+        st.info("Primeiro snapshot sendo gerado em segundo plano... use 🚀 Iniciar Scanner ou aguarde.")
     else:
-        st.warning("Nenhuma oportunidade encontrada.")
+        versao, caminho, idade = ultimo
+        st.caption(f"Snapshot #{versao} de há {idade / 60:.0f} min"
+                   + (" — atualizando em segundo plano..." if atualizador.rodando else ""))
+        # mesmo leitor do "Abrir último scan salvo": snapshot vazio ([]) volta com as colunas
+        mostrar_filtrado(ler_resultados(caminho, os.path.getmtime(caminho)), filtro_score)
@@ -0,0 +1,11 @@
+"""Scanner de BDRs: notícias, calendário e tendência das ações americanas listadas na B3."""
+
+__all__ = ['LIMITES_PADRAO', 'SwingTradeMonitor']
+
+
+def __getattr__(nome):
+    # Importa o motor só quando usado: `python -m bdr_scanner --help` não paga yfinance/textblob
+    if nome in __all__:
+        from . import monitor
+        return getattr(monitor, nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
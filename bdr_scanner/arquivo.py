@@ -0,0 +1,59 @@
+"""Arquivo histórico dos scans em Parquet particionado por dia (data=AAAA-MM-DD/).
+
+Cada scan vira um arquivo com o frame do resultado + os sinais brutos (COLUNAS_SINAIS)
+e o instante do scan. A leitura usa pyarrow.dataset: só as colunas pedidas e só as
+partições do período são lidas, então meses de scans cabem em poucos segundos.
+"""
+import os
+
+import pandas as pd
+
+from .atomico import gravar_atomico
+from .config import ARQUIVO_PATH
+
+# tipos fixos: partições gravadas em dias diferentes precisam do mesmo schema
+TIPOS = {
+    'BDR': 'string', 'US': 'string', 'Preço': 'float64', 'Tendência': 'string', 'Score': 'int64',
+    'Ação': 'string', 'Manchete': 'string', 'Resumo': 'string', 'Fonte': 'string', 'Link': 'string',
+    'Análise': 'string', 'Gatilho': 'string', 'dias_balanco': 'float64', 'dias_dividendo': 'float64',
+    'noticias_positivas': 'int64', 'pontos_noticias': 'int64',
+}
+
+
+class ArquivoScans:
+    def __init__(self, pasta=ARQUIVO_PATH):
+        self.pasta = pasta
+
+    def anexar(self, df, agora):
+        """Grava o frame de um scan (pontuar(..., sinais=True)) na partição do dia de `agora`;
+        escreve num temporário oculto e renomeia, então leitores nunca veem arquivo pela metade"""
+        if df.empty: return None
+        agora = pd.Timestamp(agora)
+        agora = agora.tz_localize(None) if agora.tzinfo else agora
+        df = df[[c for c in TIPOS if c in df.columns]].astype({c: t for c, t in TIPOS.items() if c in df.columns})
+        df = df.assign(scan_em=agora)
+        pasta = os.path.join(self.pasta, f"data={agora:%Y-%m-%d}")
+        # o temporário oculto ('.') fica fora do pyarrow.dataset até o rename
+        return gravar_atomico(os.path.join(pasta, f"scan-{agora:%H%M%S%f}.parquet"),
+                              lambda tmp: df.to_parquet(tmp, index=False))
+
+    def ler(self, colunas=None, desde=None, ate=None):
+        """Scans arquivados como DataFrame. `colunas` limita o que é lido do disco;
+        `desde`/`ate` (datas, inclusive) descartam partições inteiras sem abri-las."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if not os.path.isdir(self.pasta):
+            return pd.DataFrame(columns=list(colunas or TIPOS) + ['scan_em', 'data'])
+        particao = ds.partitioning(pa.schema([('data', pa.string())]), flavor='hive')
+        dataset = ds.dataset(self.pasta, format='parquet', partitioning=particao)
+        filtro = None
+        for op, valor in (('>=', desde), ('<=', ate)):
+            if valor is None: continue
+            cond = ds.field('data') >= _dia(valor) if op == '>=' else ds.field('data') <= _dia(valor)
+            filtro = cond if filtro is None else filtro & cond
+        return dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+
+
+def _dia(valor):
+    return pd.Timestamp(valor).strftime('%Y-%m-%d')
@@ -0,0 +1,23 @@
+"""Gravação atômica de arquivos: escreve num temporário na pasta do destino e renomeia por cima.
+
+Quem lê (a UI, o pyarrow.dataset, outro processo) nunca pega um arquivo pela metade, e
+cada escrita tem o próprio temporário (mkstemp), então processos concorrentes não colidem.
+"""
+import os
+import tempfile
+
+
+def gravar_atomico(caminho, escrever):
+    """Chama `escrever(tmp)` e faz os.replace(tmp, caminho); apaga o temporário se falhar.
+    O temporário começa com '.' (oculto: globs e o pyarrow.dataset o ignoram)."""
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(pasta, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=pasta, prefix='.', suffix=os.path.splitext(caminho)[1])
+    os.close(fd)
+    try:
+        escrever(tmp)
+        os.replace(tmp, caminho)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+    return caminho
@@ -0,0 +1,149 @@
+"""Atualização em segundo plano: repete o scan num intervalo e grava snapshots versionados.
+
+Cada snapshot é um `resultados-<versão>.json` escrito de forma atômica (salvar_resultados);
+quem lê (a UI) abre sempre o de maior versão e nunca espera um scan frio. Um Atualizador
+por processo: pedidos feitos enquanto um scan roda esperam por ele em vez de abrir outro.
+"""
+import glob
+import logging
+import os
+import re
+import threading
+import time
+
+from .config import REFRESH_INTERVALO_S, REFRESH_LIMITE, SNAPSHOTS_PATH
+
+log = logging.getLogger(__name__)
+
+MANTER_SNAPSHOTS = 5
+RECUO_S = 60  # espera depois de um scan que falhou; dobra a cada falha seguida (até o intervalo)
+_NOME = re.compile(r'resultados-(\d+)\.json$')
+
+
+def listar_snapshots(pasta):
+    """[(versão, caminho)] dos snapshots em `pasta`, da versão mais velha para a mais nova"""
+    achados = []
+    for caminho in glob.glob(os.path.join(pasta, 'resultados-*.json')):
+        m = _NOME.search(caminho)
+        if m: achados.append((int(m.group(1)), caminho))
+    return sorted(achados)
+
+
+def ultimo_snapshot(pasta=SNAPSHOTS_PATH):
+    """(versão, caminho, idade em segundos) do snapshot mais novo, ou None se não há nenhum"""
+    snapshots = listar_snapshots(pasta)
+    if not snapshots: return None
+    versao, caminho = snapshots[-1]
+    try: return versao, caminho, time.time() - os.path.getmtime(caminho)
+    except FileNotFoundError: return None  # apagado por outro processo entre o glob e o stat
+
+
+def gravar_snapshot(df, pasta=SNAPSHOTS_PATH, manter=MANTER_SNAPSHOTS):
+    """Grava `df` como a próxima versão e apaga as antigas além de `manter`; devolve (versão, caminho)"""
+    from .saida import salvar_resultados
+    snapshots = listar_snapshots(pasta)
+    versao = snapshots[-1][0] + 1 if snapshots else 1
+    caminho = os.path.join(pasta, f'resultados-{versao:06d}.json')
+    salvar_resultados(df, caminho)
+    for _, antigo in snapshots[:max(0, len(snapshots) + 1 - manter)]:
+        try: os.remove(antigo)
+        except FileNotFoundError: pass
+    return versao, caminho
+
+
+class Atualizador:
+    """Roda `criar_monitor().escanear()` a cada `intervalo` segundos (None = só sob pedido)
+    numa thread daemon, ou em primeiro plano com rodar(). `criar_monitor` monta um
+    SwingTradeMonitor novo por scan, normalmente sobre um CacheSQLite compartilhado.
+    Com `arquivo` (ArquivoScans), cada scan também vai para o histórico do backtest."""
+
+    def __init__(self, criar_monitor, pasta=SNAPSHOTS_PATH, intervalo=REFRESH_INTERVALO_S, limite=REFRESH_LIMITE,
+                 arquivo=None):
+        self.criar_monitor = criar_monitor
+        self.arquivo = arquivo
+        self.pasta = pasta
+        self.intervalo = intervalo or None
+        self.limite = limite
+        self.ultimo_erro = None
+        self._cond = threading.Condition()
+        self._pedido = False
+        self._rodando = False
+        self._geracao = 0  # scans terminados, com ou sem sucesso
+        self._falhas = 0  # falhas seguidas desde o último snapshot gravado
+        self._ultima_tentativa = None  # time.monotonic() do início do último scan
+        self._thread = None
+
+    @property
+    def rodando(self):
+        return self._rodando
+
+    def iniciar(self):
+        """Sobe a thread de atualização (uma só, mesmo chamando várias vezes)"""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.rodar, name='bdr-atualizador', daemon=True)
+                self._thread.start()
+        return self
+
+    def solicitar(self):
+        """Pede uma atualização agora e devolve a geração para o aguardar(). Com um scan
+        já rodando, o pedido pega carona nele em vez de enfileirar outro."""
+        with self._cond:
+            if not self._rodando:
+                self._pedido = True
+                self._cond.notify_all()
+            return self._geracao + 1
+
+    def aguardar(self, geracao, timeout=None):
+        """Espera o scan `geracao` terminar; False se o `timeout` venceu antes"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._geracao >= geracao, timeout)
+
+    def _espera(self):
+        """Segundos até o próximo scan agendado: conta a idade do snapshot em disco, então
+        reiniciar o servidor (ou ter outro processo atualizando) não força um scan. Depois
+        de uma falha o snapshot não anda, então espera também o recuo (60s, 120s, ...)."""
+        if self.intervalo is None: return None
+        ultimo = ultimo_snapshot(self.pasta)
+        espera = 0 if ultimo is None else self.intervalo - ultimo[2]
+        if self._falhas:
+            recuo = min(self.intervalo, RECUO_S * 2 ** (self._falhas - 1))
+            espera = max(espera, recuo - (time.monotonic() - self._ultima_tentativa))
+        return max(0, espera)
+
+    def rodar(self):
+        """Laço de atualização (bloqueia; iniciar() roda isto numa thread)"""
+        while True:
+            espera = self._espera()
+            with self._cond:
+                self._cond.wait_for(lambda: self._pedido, espera)
+                self._pedido = False
+                self._rodando = True
+            self._ultima_tentativa = time.monotonic()
+            try:
+                self.executar()
+                self.ultimo_erro, self._falhas = None, 0
+            except Exception as e:
+                self._falhas += 1
+                log.exception("Falha na atualização em segundo plano (%dª seguida)", self._falhas)
+                self.ultimo_erro = e
+            finally:
+                with self._cond:
+                    self._rodando = False
+                    self._geracao += 1
+                    self._cond.notify_all()
+
+    def executar(self):
+        """Um scan completo na thread atual; devolve (versão, caminho) do snapshot gravado.
+        Poda em SCORE_MINIMO (não muda o resultado) e reaproveita o que não mudou."""
+        # pandas/pontuação só no scan: a UI importa este módulo para ler snapshots
+        from .pontuacao import SCORE_MINIMO
+        from .saida import resultados_para_df
+        inicio = time.perf_counter()
+        monitor = self.criar_monitor()
+        bdrs = monitor.obter_bdrs_brapi(self.limite)
+        resultados = monitor.escanear(bdrs, min_score=SCORE_MINIMO, incremental=True, arquivo=self.arquivo)
+        versao, caminho = gravar_snapshot(resultados_para_df(resultados), self.pasta)
+        log.info("Snapshot %d gravado em %s (%d ativos, %.1fs)", versao, caminho, len(bdrs),
+                 time.perf_counter() - inicio)
+        return versao, caminho
@@ -0,0 +1,75 @@
+"""Backtest vetorizado do score: cruza os scans arquivados com o retorno futuro das ações.
+
+Entrada do sinal: fechamento do primeiro pregão a partir do dia do scan; saída: h pregões
+depois. Um sinal por ativo por dia (o último scan do dia). Tudo em numpy sobre o Close
+largo (datas x tickers), sem laço por sinal.
+"""
+import numpy as np
+import pandas as pd
+
+HORIZONTES_PADRAO = (1, 5, 10)
+FAIXAS_SCORE = [20, 40, 60, 80, 101]
+ROTULOS_FAIXAS = ['20-39', '40-59', '60-79', '80-100']
+COLUNAS_BACKTEST = ['US', 'Score', 'Ação', 'Gatilho', 'scan_em']  # o que é lido do arquivo
+
+
+def baixar_precos(provedor, tickers_us, inicio, fim=None):
+    """Close diário (datas x tickers) de todos os tickers numa única requisição, pelo provedor
+    (ao vivo, gravando ou em replay)"""
+    tickers_us = list(dict.fromkeys(t for t in tickers_us if t))
+    dados = provedor.historico_periodo(tickers_us, pd.Timestamp(inicio).strftime('%Y-%m-%d'),
+                                       None if fim is None else pd.Timestamp(fim).strftime('%Y-%m-%d'))
+    close = dados['Close'] if dados is not None and not dados.empty else pd.DataFrame()
+    if isinstance(close, pd.Series):
+        close = close.to_frame(tickers_us[0])
+    if getattr(close.index, 'tz', None) is not None:
+        close.index = close.index.tz_localize(None)
+    return close.reindex(columns=tickers_us)
+
+
+def retornos_futuros(sinais, close, horizontes=HORIZONTES_PADRAO):
+    """Acrescenta `ret_<h>d` a `sinais` (colunas US, scan_em): retorno simples de h pregões;
+    NaN quando o ticker não tem preço ou o horizonte ainda não passou"""
+    close = close.sort_index().ffill()
+    valores = close.to_numpy(dtype=float)
+    n = len(close)
+    entrada = close.index.searchsorted(pd.to_datetime(sinais['scan_em']).dt.normalize().to_numpy(), side='left')
+    coluna = close.columns.get_indexer(sinais['US'])
+    valido = (coluna >= 0) & (entrada < n)
+    coluna, entrada_ok = np.where(valido, coluna, 0), np.where(valido, entrada, 0)
+    preco_entrada = np.where(valido, valores[entrada_ok, coluna] if n else np.nan, np.nan)
+
+    sinais = sinais.copy()
+    for h in horizontes:
+        saida = entrada + h
+        ok = valido & (saida < n)
+        preco_saida = np.where(ok, valores[np.where(ok, saida, 0), coluna] if n else np.nan, np.nan)
+        sinais[f'ret_{h}d'] = preco_saida / preco_entrada - 1
+    return sinais
+
+
+def _resumo(df, chave, horizontes):
+    """n, taxa de acerto (retorno > 0) e retorno médio por grupo, para cada horizonte"""
+    grupos = df[chave]
+    partes = {}
+    for h in horizontes:
+        ret = df[f'ret_{h}d']
+        partes[f'n_{h}d'] = ret.notna().groupby(grupos, observed=True).sum()
+        partes[f'acerto_{h}d'] = (ret > 0).where(ret.notna()).astype(float).groupby(grupos, observed=True).mean()
+        partes[f'retorno_{h}d'] = ret.groupby(grupos, observed=True).mean()
+    return pd.DataFrame(partes)
+
+
+def backtest(scans, close, horizontes=HORIZONTES_PADRAO):
+    """Resumo por faixa de score e por Gatilho. `scans` vem de ArquivoScans.ler(COLUNAS_BACKTEST),
+    `close` de baixar_precos(). Devolve {'por_faixa': df, 'por_gatilho': df, 'sinais': n}."""
+    scans = scans.sort_values('scan_em', kind='stable')
+    dia = pd.to_datetime(scans['scan_em']).dt.normalize()
+    sinais = scans[~pd.DataFrame({'US': scans['US'], 'dia': dia}).duplicated(keep='last')]
+    sinais = retornos_futuros(sinais.reset_index(drop=True), close, horizontes)
+    sinais['faixa'] = pd.cut(sinais['Score'], FAIXAS_SCORE, right=False, labels=ROTULOS_FAIXAS)
+    return {
+        'por_faixa': _resumo(sinais, 'faixa', horizontes),
+        'por_gatilho': _resumo(sinais, 'Gatilho', horizontes),
+        'sinais': len(sinais),
+    }
@@ -0,0 +1,132 @@
+"""Cache persistente das respostas dos upstreams (Yahoo, Finnhub, BRAPI, tradução).
+
+Guarda as entradas num SQLite local, compartilhado entre sessões do Streamlit e
+processos, com TTL por tipo de dado e despejo LRU quando passa do limite.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+# TTL em segundos por tipo de dado (None = não expira)
+TTLS_PADRAO = {
+    'calendario': 6 * 3600,
+    'info': 6 * 3600,
+    'noticias': 15 * 60,
+    'brapi': 3600,
+    'traducao': None,
+    'sentimento': None,
+    'estado': 6 * 3600,  # coleta do último scan (rescan incremental); expira junto com calendário/info
+}
+LOTE_ACESSOS = 256  # hits acumulados em memória antes de gravar o `acessado` de uma vez
+
+
+def chave_texto(texto):
+    """Chave curta e estável para textos longos (traduções, sentimento...)"""
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+class CacheNulo:
+    """Cache que nunca guarda nada (comportamento sem cache)"""
+
+    def obter(self, tipo, chave):
+        return False, None
+
+    def gravar(self, tipo, chave, valor):
+        pass
+
+    def memo(self, tipo, chave, func):
+        """Devolve o valor em cache ou chama `func()` e guarda o resultado.
+        Exceções de `func` sobem sem gravar nada (falhas não ficam em cache)."""
+        achou, valor = self.obter(tipo, chave)
+        if achou: return valor
+        valor = func()
+        self.gravar(tipo, chave, valor)
+        return valor
+
+    def estatisticas(self):
+        return {}
+
+
+class CacheSQLite(CacheNulo):
+    """Cache em SQLite com TTL por tipo e despejo LRU por `max_entradas`"""
+
+    def __init__(self, caminho, ttls=None, max_entradas=50_000):
+        pasta = os.path.dirname(caminho)
+        if pasta: os.makedirs(pasta, exist_ok=True)
+        self.ttls = {**TTLS_PADRAO, **(ttls or {})}
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._hits, self._misses = Counter(), Counter()
+        self._gravacoes = 0
+        self._acessos = {}  # (tipo, chave) -> último hit ainda não gravado
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                tipo TEXT NOT NULL, chave TEXT NOT NULL, valor BLOB,
+                criado REAL NOT NULL, acessado REAL NOT NULL,
+                PRIMARY KEY (tipo, chave))""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_acessado ON cache(acessado)")
+
+    def obter(self, tipo, chave):
+        agora = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT valor, criado FROM cache WHERE tipo = ? AND chave = ?", (tipo, chave)).fetchone()
+            ttl = self.ttls.get(tipo)
+            if row and (ttl is None or agora - row[1] <= ttl):
+                # o hit não escreve no SQLite: o LRU só precisa da ordem aproximada
+                self._acessos[tipo, chave] = agora
+                if len(self._acessos) >= LOTE_ACESSOS: self._gravar_acessos()
+                self._hits[tipo] += 1
+                return True, pickle.loads(row[0])
+            self._misses[tipo] += 1
+            return False, None
+
+    def gravar(self, tipo, chave, valor):
+        agora = time.time()
+        dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (tipo, chave, valor, criado, acessado) VALUES (?, ?, ?, ?, ?)",
+                (tipo, chave, sqlite3.Binary(dados), agora, agora))
+            self._gravacoes += 1
+            if self._gravacoes % 100 == 0:
+                self._despejar()
+
+    def _gravar_acessos(self):
+        """Grava os hits pendentes numa só transação (com o lock já tomado)"""
+        if not self._acessos: return
+        pendentes, self._acessos = self._acessos, {}
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "UPDATE cache SET acessado = max(acessado, ?) WHERE tipo = ? AND chave = ?",
+                [(t, tipo, chave) for (tipo, chave), t in pendentes.items()])
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _despejar(self):
+        """Remove o que passou do limite, do acesso mais antigo para o mais novo"""
+        self._gravar_acessos()
+        self._conn.execute(
+            "DELETE FROM cache WHERE rowid IN "
+            "(SELECT rowid FROM cache ORDER BY acessado DESC LIMIT -1 OFFSET ?)", (self.max_entradas,))
+
+    def limpar(self, tipo=None):
+        with self._lock:
+            self._acessos = {k: t for k, t in self._acessos.items() if tipo and k[0] != tipo}
+            if tipo: self._conn.execute("DELETE FROM cache WHERE tipo = ?", (tipo,))
+            else: self._conn.execute("DELETE FROM cache")
+
+    def estatisticas(self):
+        """Contadores de hit/miss por tipo desde que o cache foi aberto neste processo"""
+        with self._lock:
+            tipos = sorted(set(self._hits) | set(self._misses))
+            return {t: {'hits': self._hits[t], 'misses': self._misses[t]} for t in tipos}
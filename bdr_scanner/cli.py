@@ -0,0 +1,255 @@
+"""Execução sem Streamlit: python -m bdr_scanner scan --limit 60 --min-score 20 --out resultados.parquet"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from .config import (ARQUIVO_PATH, CACHE_PATH, MAPA_PATH, REFRESH_INTERVALO_S, REFRESH_LIMITE, RESULTADOS_PATH,
+                     SNAPSHOTS_PATH)
+
+
+def _scan(args):
+    from .cache import CacheNulo, CacheSQLite
+    from .instrumentacao import Instrumentacao, perfil_cprofile
+    from .monitor import LIMITES_PADRAO, SwingTradeMonitor
+    from .provedores import ProvedorGravador, ProvedorReplay
+    from .tickers import MAPA_PACOTE, MapaTickers
+
+    limites = {k: getattr(args, k) or v for k, v in LIMITES_PADRAO.items()}
+    # replay/gravação sem cache: senão as respostas saem do SQLite e não do fixture
+    cache = CacheNulo() if args.no_cache or args.replay or args.gravar else CacheSQLite(args.cache)
+    inst = Instrumentacao() if args.report else None
+    mapa = None
+    if args.replay and os.path.exists(os.path.join(args.replay, 'mapa.csv')):
+        # fixtures sintéticas trazem o próprio mapa BDR -> US
+        mapa = MapaTickers.carregar([MAPA_PACOTE, MAPA_PATH, os.path.join(args.replay, 'mapa.csv')])
+    monitor = SwingTradeMonitor(limites, cache=cache, instrumentacao=inst, mapa=mapa)
+    if args.replay:
+        monitor.provedor = ProvedorReplay(args.replay, latencia=args.latencia_ms / 1000)
+    elif args.gravar:
+        monitor.provedor = ProvedorGravador(monitor.provedor, args.gravar)
+    if args.profile:
+        # o cProfile só enxerga a thread atual: perfila o scan em série
+        args.serial = True
+        with perfil_cprofile(args.profile) as perfil:
+            codigo = _executar_scan(args, monitor)
+        sys.stderr.write(perfil['texto'])
+    else:
+        codigo = _executar_scan(args, monitor)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(monitor.relatorio_desempenho(), f, ensure_ascii=False, indent=2)
+    return codigo
+
+
+def _executar_scan(args, monitor):
+    from .arquivo import ArquivoScans
+    from .saida import resultados_para_df, salvar_resultados
+
+    inicio = time.perf_counter()
+    arquivo = ArquivoScans(args.arquivo) if args.arquivo else None
+    bdrs = monitor.obter_bdrs_brapi(args.limit)
+
+    def progresso(feitos, total, bdr):
+        logging.info("%d/%d %s", feitos, total, bdr)
+
+    if args.stream:
+        # JSON Lines no stdout conforme cada ativo termina
+        resultados = []
+        for feitos, total, bdr, res in monitor.escanear_stream(bdrs, paralelo=not args.serial,
+                                                                  min_score=args.min_score,
+                                                                  incremental=args.incremental,
+                                                                  arquivo=arquivo):
+            progresso(feitos, total, bdr)
+            if not res or res['Score'] < args.min_score: continue
+            if not args.no_translate: monitor.traduzir_resultados([res])
+            resultados.append(res)
+            sys.stdout.write(json.dumps(res, ensure_ascii=False, default=str) + '\n')
+            sys.stdout.flush()
+    else:
+        resultados = monitor.escanear(bdrs, progresso=progresso, paralelo=not args.serial,
+                                      traduzir=not args.no_translate, min_score=args.min_score,
+                                      incremental=args.incremental, arquivo=arquivo)
+    df = resultados_para_df(resultados, args.min_score)
+    logging.info("%d oportunidades em %d ativos (%.1fs)", len(df), len(bdrs), time.perf_counter() - inicio)
+
+    if args.stream and args.out == '-':
+        pass
+    elif args.out == '-':
+        df.to_json(sys.stdout, orient='records', force_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    else:
+        salvar_resultados(df, args.out)
+    return 0
+
+
+def _mapa(args):
+    from .cache import CacheNulo, CacheSQLite
+    from .monitor import SwingTradeMonitor
+    from .tickers import MapaTickers
+
+    mapa = MapaTickers.carregar()
+    if args.atualizar:
+        cache = CacheNulo() if args.no_cache else CacheSQLite(args.cache)
+        universo = SwingTradeMonitor(cache=cache, mapa=mapa).obter_bdrs_brapi(limite=None)
+        mapa, sem_mapa = mapa.atualizar_da_brapi(universo)
+        mapa.salvar(args.saida)
+        logging.info("%d BDRs mapeados gravados em %s", len(mapa.bdr_para_us), args.saida)
+        for bdr in sem_mapa:
+            print(bdr)
+    else:
+        for bdr, us in sorted(mapa.bdr_para_us.items()):
+            print(f"{bdr},{us}")
+    return 0
+
+
+def _atualizar(args):
+    from .arquivo import ArquivoScans
+    from .atualizador import Atualizador
+    from .cache import CacheSQLite
+    from .monitor import SwingTradeMonitor
+
+    cache = CacheSQLite(args.cache)
+    arquivo = None if args.sem_arquivo else ArquivoScans(args.arquivo)
+    atualizador = Atualizador(lambda: SwingTradeMonitor(cache=cache), args.pasta, args.intervalo, args.limit,
+                              arquivo)
+    if args.uma_vez:
+        versao, caminho = atualizador.executar()
+        print(caminho)
+        return 0
+    atualizador.rodar()
+
+
+def _backtest(args):
+    import pandas as pd
+
+    from .arquivo import ArquivoScans
+    from .backtest import COLUNAS_BACKTEST, backtest, baixar_precos
+    from .config import BRAPI_TOKEN, FINNHUB_KEY
+    from .provedores import ProvedorAoVivo, ProvedorGravador, ProvedorReplay
+    from .transporte import Transporte
+
+    inicio = time.perf_counter()
+    scans = ArquivoScans(args.arquivo).ler(COLUNAS_BACKTEST, args.desde, args.ate)
+    if scans.empty:
+        logging.warning("Nenhum scan arquivado em %s", args.arquivo)
+        return 1
+    if args.replay:
+        provedor = ProvedorReplay(args.replay)
+    else:
+        provedor = ProvedorAoVivo(Transporte(), FINNHUB_KEY, BRAPI_TOKEN)
+        if args.gravar: provedor = ProvedorGravador(provedor, args.gravar)
+    close = baixar_precos(provedor, scans['US'].unique(), pd.to_datetime(scans['scan_em']).min())
+    resumo = backtest(scans, close, args.horizontes)
+    logging.info("%d sinais de %d linhas arquivadas (%.1fs)", resumo['sinais'], len(scans),
+                 time.perf_counter() - inicio)
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.4f}'.format):
+        print("Por faixa de score:\n", resumo['por_faixa'], "\n\nPor gatilho:\n", resumo['por_gatilho'], sep='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sinais': resumo['sinais'],
+                       'por_faixa': resumo['por_faixa'].reset_index().to_dict('records'),
+                       'por_gatilho': resumo['por_gatilho'].reset_index().to_dict('records')},
+                      f, ensure_ascii=False, indent=2, default=str)
+    return 0
+
+
+def _vigiar(args):
+    from .cache import CacheNulo, CacheSQLite
+    from .monitor import SwingTradeMonitor
+    from .vigia import DestinoArquivo, DestinoStdout, DestinoWebhook, Vigia
+
+    cache = CacheNulo() if args.no_cache else CacheSQLite(args.cache)
+    monitor = SwingTradeMonitor(cache=cache)
+    destinos = [DestinoArquivo(c) for c in args.alertas] + [DestinoWebhook(u, monitor.http) for u in args.webhook]
+    if args.stdout or not destinos: destinos.append(DestinoStdout())
+    bdrs = args.bdrs or monitor.obter_bdrs_brapi(args.limit)
+    logging.info("Vigiando %d BDRs a cada %gs", len(bdrs), args.intervalo)
+    Vigia(monitor, bdrs, destinos, args.limiar).rodar(args.intervalo, args.rodadas)
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='bdr_scanner', description="Scanner de BDRs sem interface")
+    parser.add_argument('-v', '--verbose', action='store_true', help="mostra o progresso no stderr")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    scan = sub.add_parser('scan', help="roda um scan completo e grava os resultados")
+    scan.add_argument('--limit', type=int, default=30, help="quantidade de BDRs (por volume)")
+    scan.add_argument('--min-score', type=int, default=20)
+    scan.add_argument('--out', default=RESULTADOS_PATH,
+                      help="arquivo .json/.csv/.parquet ou '-' para stdout (padrão: %(default)s)")
+    scan.add_argument('--stream', action='store_true',
+                      help="escreve cada resultado em JSON Lines no stdout assim que fica pronto")
+    scan.add_argument('--serial', action='store_true', help="analisa um ativo por vez")
+    scan.add_argument('--no-translate', action='store_true', help="mantém manchetes no original")
+    scan.add_argument('--incremental', action='store_true',
+                      help="reaproveita, pelo cache, a coleta dos ativos cujas notícias não mudaram")
+    scan.add_argument('--arquivo', metavar='DIR', help="anexa o scan ao histórico Parquet em DIR "
+                      "(backtest; só com --min-score até 20)")
+    scan.add_argument('--report', metavar='JSON', help="grava o relatório de desempenho por etapa")
+    scan.add_argument('--profile', metavar='PROF', help="roda o scan (em série) sob cProfile e grava o .prof")
+    scan.add_argument('--cache', default=CACHE_PATH, help="arquivo SQLite do cache (padrão: %(default)s)")
+    scan.add_argument('--no-cache', action='store_true')
+    fixtures = scan.add_mutually_exclusive_group()
+    fixtures.add_argument('--gravar', metavar='DIR', help="grava as respostas dos upstreams em DIR")
+    fixtures.add_argument('--replay', metavar='DIR', help="usa as respostas gravadas em DIR, sem rede")
+    scan.add_argument('--latencia-ms', type=float, default=0,
+                      help="latência injetada por chamada no --replay (padrão: %(default)s)")
+    for nome in ('ativos', 'yahoo', 'finnhub', 'traducao'):
+        scan.add_argument(f'--{nome}', type=int, metavar='N', help=f"limite de concorrência '{nome}'")
+    scan.set_defaults(func=_scan)
+
+    atualizar = sub.add_parser('atualizar', help="worker: repete o scan no intervalo e grava snapshots p/ a UI")
+    atualizar.add_argument('--intervalo', type=float, default=REFRESH_INTERVALO_S,
+                           help="segundos entre scans (padrão: %(default)s)")
+    atualizar.add_argument('--limit', type=int, default=REFRESH_LIMITE, help="quantidade de BDRs (por volume)")
+    atualizar.add_argument('--pasta', default=SNAPSHOTS_PATH, help="pasta dos snapshots (padrão: %(default)s)")
+    atualizar.add_argument('--uma-vez', action='store_true', help="grava um snapshot e sai (cron)")
+    atualizar.add_argument('--arquivo', default=ARQUIVO_PATH,
+                           help="histórico Parquet dos scans (padrão: %(default)s)")
+    atualizar.add_argument('--sem-arquivo', action='store_true', help="não arquiva os scans")
+    atualizar.add_argument('--cache', default=CACHE_PATH)
+    atualizar.set_defaults(func=_atualizar)
+
+    vigiar = sub.add_parser('vigiar', help="acompanha as notícias e alerta quem vira COMPRAR AGORA")
+    vigiar.add_argument('--limit', type=int, default=30, help="quantidade de BDRs (por volume)")
+    vigiar.add_argument('--bdrs', nargs='+', metavar='BDR', help="lista fixa de BDRs (em vez do --limit)")
+    vigiar.add_argument('--intervalo', type=float, default=120, help="segundos entre rodadas (padrão: %(default)s)")
+    vigiar.add_argument('--limiar', type=int, default=60, help="score do alerta (padrão: %(default)s)")
+    vigiar.add_argument('--rodadas', type=int, help="para depois de N rodadas (padrão: não para)")
+    vigiar.add_argument('--stdout', action='store_true', help="alertas em JSON Lines no stdout (padrão sem destino)")
+    vigiar.add_argument('--alertas', action='append', default=[], metavar='ARQ', help="acrescenta em ARQ (JSON Lines)")
+    vigiar.add_argument('--webhook', action='append', default=[], metavar='URL', help="POST JSON em URL")
+    vigiar.add_argument('--cache', default=CACHE_PATH)
+    vigiar.add_argument('--no-cache', action='store_true')
+    vigiar.set_defaults(func=_vigiar)
+
+    bt = sub.add_parser('backtest', help="taxa de acerto e retorno médio por faixa de score e por gatilho")
+    bt.add_argument('--arquivo', default=ARQUIVO_PATH, help="histórico Parquet dos scans (padrão: %(default)s)")
+    bt.add_argument('--desde', help="primeiro dia (AAAA-MM-DD)")
+    bt.add_argument('--ate', help="último dia (AAAA-MM-DD)")
+    bt.add_argument('--horizontes', type=int, nargs='+', default=[1, 5, 10], help="pregões à frente")
+    bt.add_argument('--json', metavar='ARQ', help="grava o resumo em JSON")
+    precos = bt.add_mutually_exclusive_group()
+    precos.add_argument('--gravar', metavar='DIR', help="grava os preços baixados em DIR")
+    precos.add_argument('--replay', metavar='DIR', help="usa os preços gravados em DIR, sem rede")
+    bt.set_defaults(func=_backtest)
+
+    mapa = sub.add_parser('mapa', help="mostra o mapa BDR -> US ou atualiza pela lista da BRAPI")
+    mapa.add_argument('--atualizar', action='store_true',
+                      help="cruza com a lista da BRAPI, grava o CSV local e lista os BDRs sem mapeamento")
+    mapa.add_argument('--saida', default=MAPA_PATH, help="CSV local do mapa (padrão: %(default)s)")
+    mapa.add_argument('--cache', default=CACHE_PATH)
+    mapa.add_argument('--no-cache', action='store_true')
+    mapa.set_defaults(func=_mapa)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    return args.func(args)
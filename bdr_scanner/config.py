@@ -0,0 +1,21 @@
+"""Configuração do scanner lida do ambiente (a UI sobrescreve com st.secrets)."""
+import os
+
+# --- SEGREDOS ---
+FINNHUB_KEY = os.environ.get("FINNHUB_API_KEY", "d4uouchr01qnm7pnasq0d4uouchr01qnm7pnasqg")
+BRAPI_TOKEN = os.environ.get("BRAPI_API_TOKEN", "iExnKM1xcbQcYL3cNPhPQ3")
+
+# --- CONCORRÊNCIA ---
+# 'ativos' = tickers analisados ao mesmo tempo; demais = chamadas simultâneas por upstream
+LIMITES_PADRAO = {'ativos': 8, 'yahoo': 6, 'finnhub': 4, 'traducao': 4}
+
+# --- ARQUIVOS LOCAIS ---
+CACHE_PATH = os.environ.get("BDR_CACHE_PATH", os.path.join(".cache", "bdr_scanner.sqlite"))
+MAPA_PATH = os.environ.get("BDR_MAPA_PATH", os.path.join(".cache", "mapa_bdr_us.csv"))
+RESULTADOS_PATH = os.environ.get("BDR_RESULTS_PATH", os.path.join(".cache", "resultados.json"))
+SNAPSHOTS_PATH = os.environ.get("BDR_SNAPSHOTS_PATH", os.path.join(".cache", "snapshots"))
+ARQUIVO_PATH = os.environ.get("BDR_ARQUIVO_PATH", os.path.join(".cache", "arquivo"))  # histórico p/ backtest
+
+# --- ATUALIZAÇÃO EM SEGUNDO PLANO ---
+REFRESH_INTERVALO_S = float(os.environ.get("BDR_REFRESH_S", 15 * 60))  # 0 = só sob pedido
+REFRESH_LIMITE = int(os.environ.get("BDR_REFRESH_LIMIT", 60))  # BDRs por scan (por volume)
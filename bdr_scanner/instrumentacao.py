@@ -0,0 +1,115 @@
+"""Instrumentação do scan: tempo por etapa, falhas por upstream e perfil opcional.
+
+Desligada (InstrumentacaoNula, o padrão) cada span é um nullcontext compartilhado,
+então o custo no caminho quente é só uma chamada de método.
+"""
+import cProfile
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from io import StringIO
+
+_NULO = nullcontext()
+
+
+def _percentil(ordenados, p):
+    """Percentil por posição mais próxima (lista já ordenada)"""
+    if not ordenados: return 0.0
+    return ordenados[min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados) + 0.5) - 1))]
+
+
+def tipo_falha(erro):
+    """'timeout' para exceções de tempo esgotado (requests, curl, socket), senão 'erro'"""
+    if isinstance(erro, TimeoutError) or 'timeout' in type(erro).__name__.lower():
+        return 'timeout'
+    causa = getattr(erro, 'causa', None)  # ErroUpstream embrulha o erro de rede
+    return tipo_falha(causa) if causa is not None else 'erro'
+
+
+class InstrumentacaoNula:
+    ativa = False
+
+    def span(self, etapa):
+        return _NULO
+
+    def contar(self, upstream, evento, n=1):
+        pass
+
+    def falha(self, upstream, erro):
+        pass
+
+    def relatorio(self):
+        return {}
+
+
+class Instrumentacao(InstrumentacaoNula):
+    ativa = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self._duracoes = defaultdict(list)
+            self._contadores = defaultdict(lambda: defaultdict(int))
+            self._inicio = time.perf_counter()
+            self._inicio_relogio = datetime.now()
+
+    @contextmanager
+    def span(self, etapa):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                self._duracoes[etapa].append(duracao)
+
+    def contar(self, upstream, evento, n=1):
+        """Eventos por upstream: 'erro', 'timeout', 'vazio'..."""
+        with self._lock:
+            self._contadores[upstream][evento] += n
+
+    def falha(self, upstream, erro):
+        self.contar(upstream, tipo_falha(erro))
+
+    def relatorio(self):
+        """Resumo do scan: por etapa (chamadas, total, p50, p95, máx em ms) e contadores"""
+        with self._lock:
+            etapas = {}
+            for etapa, duracoes in sorted(self._duracoes.items()):
+                ordenadas = sorted(duracoes)
+                etapas[etapa] = {
+                    'chamadas': len(ordenadas),
+                    'total_ms': round(sum(ordenadas) * 1000, 2),
+                    'p50_ms': round(_percentil(ordenadas, 50) * 1000, 2),
+                    'p95_ms': round(_percentil(ordenadas, 95) * 1000, 2),
+                    'max_ms': round(ordenadas[-1] * 1000, 2),
+                }
+            return {
+                'inicio': self._inicio_relogio.isoformat(timespec='seconds'),
+                'duracao_s': round(time.perf_counter() - self._inicio, 3),
+                'etapas': etapas,
+                'contadores': {u: dict(c) for u, c in sorted(self._contadores.items())},
+            }
+
+
+@contextmanager
+def perfil_cprofile(caminho=None, linhas=25):
+    """Roda o bloco sob cProfile. Grava o .prof em `caminho` (abre no snakeviz/pstats)
+    e devolve em `resultado['texto']` o top por tempo acumulado."""
+    resultado = {}
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield resultado
+    finally:
+        perfil.disable()
+        if caminho: perfil.dump_stats(caminho)
+        saida = StringIO()
+        pstats.Stats(perfil, stream=saida).sort_stats('cumulative').print_stats(linhas)
+        resultado['texto'] = saida.getvalue()
@@ -0,0 +1,454 @@
+"""Motor do scanner: coleta Yahoo/Finnhub/BRAPI, pontua e traduz as oportunidades."""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheNulo, chave_texto
+from .config import BRAPI_TOKEN, FINNHUB_KEY, LIMITES_PADRAO
+from .instrumentacao import InstrumentacaoNula
+from .noticias import MemoSentimento, id_noticia
+from .pontuacao import (COLUNAS_SINAIS, FONTE_TECNICA, MAX_NOTICIAS, SCORE_CORTE_NOTICIAS, SCORE_MINIMO,
+                        gerar_analise_compra, linha_ativo, linhas_noticias, pontuar_ativo,
+                        pontuar_coletas, score_maximo)
+from .provedores import ProvedorAoVivo
+from .tickers import MapaTickers
+from .transporte import ErroUpstream, Transporte
+from .universo import pares_bdr, top_por_volume
+
+log = logging.getLogger(__name__)
+
+# --- TRADUÇÃO ---
+TAMANHO_LOTE_TRADUCAO = 20
+
+_PENDENTE = object()  # dado ainda não buscado
+
+# --- CLASSE MONITOR ---
+class SwingTradeMonitor:
+    def __init__(self, limites=None, cache=None, finnhub_key=None, brapi_token=None, mapa=None, http=None,
+                 instrumentacao=None, provedor=None, sentimento=None):
+        self.finnhub_key = finnhub_key or FINNHUB_KEY
+        self.brapi_token = brapi_token or BRAPI_TOKEN
+        self._memoria_traducao = {}  # sha1 do texto -> tradução, vale durante a vida do monitor
+        self.mapa = mapa or MapaTickers.carregar()
+        self.limites = {**LIMITES_PADRAO, **(limites or {})}
+        self._slots = {k: threading.BoundedSemaphore(v) for k, v in self.limites.items() if k != 'ativos'}
+        self._io = None  # pool de chamadas folha, ativo apenas durante escanear()
+        self._precos = {}  # preço/tendência pré-calculados em lote por carregar_precos()
+        self.cache = cache or CacheNulo()
+        self.http = http or Transporte()
+        # origem dos dados externos: ao vivo por padrão; ProvedorGravador/ProvedorReplay p/ fixtures
+        self.provedor = provedor or ProvedorAoVivo(self.http, self.finnhub_key, self.brapi_token)
+        self.inst = instrumentacao or InstrumentacaoNula()
+        # http/provedor/sentimento são thread-safe: a UI cria uma vez e divide entre os monitores
+        self.sentimento = sentimento or MemoSentimento(self.cache)
+
+    def _paralelo(self, *funcs):
+        """Executa chamadas independentes; a 1ª roda na thread atual, as demais no pool de I/O.
+        Só chamadas folha (sem _paralelo interno) podem ir para o pool, senão ele trava."""
+        if self._io is None or len(funcs) == 1:
+            return [f() for f in funcs]
+        futuros = [self._io.submit(f) for f in funcs[1:]]
+        return [funcs[0]()] + [f.result() for f in futuros]
+        
+    @property
+    def ticker_map(self):
+        """{US: BDR} do mapa carregado (compatibilidade com o dicionário antigo)"""
+        return self.mapa.us_para_bdr
+
+    def traduzir(self, texto):
+        """Traduz texto para PT-BR com tratamento de erro"""
+        if not texto or len(texto) < 3: return ""
+        return self.traduzir_lote([texto])[texto]
+
+    def traduzir_lote(self, textos):
+        """Traduz vários textos de uma vez: deduplica pelo hash do conteúdo, consulta a
+        memória de tradução (memória local + cache persistente) e manda só o que falta em
+        lotes para o translate_batch. Devolve {texto: tradução}; falhas mantêm o original."""
+        unicos = {chave_texto(t): t for t in textos if t and len(t) >= 3}
+        faltando = {}
+        for chave, texto in unicos.items():
+            if chave in self._memoria_traducao: continue
+            achou, traducao = self.cache.obter('traducao', chave)
+            if achou: self._memoria_traducao[chave] = traducao
+            else: faltando[chave] = texto
+
+        chaves = list(faltando)
+        lotes = [chaves[i:i + TAMANHO_LOTE_TRADUCAO] for i in range(0, len(chaves), TAMANHO_LOTE_TRADUCAO)]
+
+        def traduzir_um(chave):
+            try:
+                with self._slots['traducao'], self.inst.span('traducao.texto'):
+                    return self.provedor.traduzir_lote([faltando[chave]])[0]
+            except Exception as e:
+                self.inst.falha('traducao', e)
+                return None  # Mantém o original se falhar a API de tradução
+
+        def traduzir_api(lote):
+            try:
+                with self._slots['traducao'], self.inst.span('traducao.lote'):
+                    traducoes = self.provedor.traduzir_lote([faltando[c] for c in lote])
+            except Exception as e:
+                # o translate_batch para no primeiro texto que falha: refaz o lote um a um
+                # para um texto ruim (longo demais, sem tradução...) não derrubar os outros
+                self.inst.falha('traducao.lote', e)
+                traducoes = [traduzir_um(c) for c in lote]
+            for chave, traducao in zip(lote, traducoes):
+                if traducao is None: continue
+                self._memoria_traducao[chave] = traducao
+                self.cache.gravar('traducao', chave, traducao)
+
+        if len(lotes) > 1:
+            with ThreadPoolExecutor(self.limites['traducao'], thread_name_prefix='bdr-traducao') as pool:
+                list(pool.map(traduzir_api, lotes))
+        else:
+            for lote in lotes: traduzir_api(lote)
+
+        return {t: ("" if not t or len(t) < 3 else self._memoria_traducao.get(chave_texto(t), t)) for t in textos}
+
+    def traduzir_resultados(self, resultados):
+        """Traduz de uma vez manchete/resumo de todos os resultados (in-place)"""
+        alvos = [r for r in resultados if r and r['Fonte'] != FONTE_TECNICA]
+        traducoes = self.traduzir_lote([r['Manchete'] for r in alvos] + [r['Resumo'] for r in alvos if r['Resumo']])
+        for r in alvos:
+            r['Manchete'] = traducoes[r['Manchete']]
+            if r['Resumo']: r['Resumo'] = traducoes[r['Resumo']]
+        return resultados
+
+    def obter_bdrs_brapi(self, limite=50):
+        def listar_bdrs():
+            with self.inst.span('brapi.lista'):
+                # o ProvedorAoVivo já devolve só os BDRs (leitura em streaming); gravações
+                # antigas trazem a lista completa, então filtra de novo
+                pares = pares_bdr(self.provedor.lista_brapi().get('stocks', []))
+            if not pares: raise ValueError("quote/list sem BDRs")  # não guarda vazio no cache
+            return pares
+        try:
+            # guarda só (stock, volume) dos BDRs; o top-N sai por seleção parcial a cada chamada
+            return top_por_volume(self.cache.memo('brapi', 'quote/list:bdrs', listar_bdrs), limite)
+        except Exception as e:
+            self.inst.falha('brapi', e)
+            return self.mapa.bdrs()[:limite]
+
+    def converter_para_us(self, bdr):
+        """Ticker americano do BDR; None se não está no mapa (o ativo é pulado)"""
+        return self.mapa.us(bdr)
+
+    def _yahoo_calendario(self, ticker_us):
+        def buscar():
+            with self._slots['yahoo'], self.inst.span('yahoo.calendario'):
+                cal = self.provedor.calendario(ticker_us)
+            if not cal: self.inst.contar('yahoo.calendario', 'vazio')
+            return cal.get('Earnings Date', [None])[0] if cal else None
+        try: return self.cache.memo('calendario', ticker_us, buscar)
+        except Exception as e:
+            self.inst.falha('yahoo.calendario', e)
+            return None
+
+    def _yahoo_info(self, ticker_us):
+        def buscar():
+            with self._slots['yahoo'], self.inst.span('yahoo.info'):
+                info = self.provedor.info(ticker_us)
+            if not info: self.inst.contar('yahoo.info', 'vazio')
+            return info.get('exDividendDate'), info.get('dividendYield')
+        try: return self.cache.memo('info', ticker_us, buscar)
+        except Exception as e:
+            self.inst.falha('yahoo.info', e)
+            return None, None
+
+    def _yahoo_historico(self, ticker_us):
+        try:
+            with self._slots['yahoo'], self.inst.span('yahoo.historico'):
+                hist = self.provedor.historico(ticker_us)
+            if hist.empty: self.inst.contar('yahoo.historico', 'vazio')
+            return hist, None
+        except Exception as e:
+            self.inst.falha('yahoo.historico', e)
+            return None, e
+
+    @staticmethod
+    def calcular_precos(close):
+        """Preço (último Close) e tendência (vs média do período) vetorizados sobre o
+        Close largo (datas x tickers). Mesma regra do cálculo por ticker."""
+        ultimo = close.ffill().iloc[-1] if len(close) else pd.Series(np.nan, index=close.columns)
+        vazio = close.notna().sum() == 0
+        trend = np.where(vazio, "Lateral", np.where(ultimo > close.mean(), "Alta 📈", "Baixa 📉"))
+        return pd.DataFrame({'price': ultimo.where(~vazio, 0), 'trend': trend}, index=close.columns)
+
+    def carregar_precos(self, tickers_us):
+        """Baixa o histórico de 1 mês de todos os tickers numa única requisição
+        (provedor.historico_lote) e guarda preço/tendência para o get_yahoo_data"""
+        tickers_us = list(dict.fromkeys(t for t in tickers_us if t))
+        if not tickers_us: return {}
+        with self._slots['yahoo'], self.inst.span('yahoo.lote_precos'):
+            dados = self.provedor.historico_lote(tickers_us)
+        close = dados['Close'] if dados is not None and not dados.empty else pd.DataFrame()
+        if isinstance(close, pd.Series):
+            close = close.to_frame(tickers_us[0])
+        close = close.reindex(columns=tickers_us)
+        self._precos = self.calcular_precos(close).to_dict('index')
+        return self._precos
+
+    def preparar_precos(self, bdrs):
+        """Preço/tendência de todos os `bdrs` num download só (carregar_precos) antes das
+        coletas; se o lote falhar, conta a falha e cada ativo busca o próprio histórico"""
+        try: return self.carregar_precos([self.converter_para_us(b) for b in bdrs])
+        except Exception as e:
+            self.inst.falha('yahoo.lote_precos', e)
+            self._precos = {}
+            return {}
+
+    def get_yahoo_data(self, ticker_us, earn_date=_PENDENTE):
+        """Balanço, dividendos, preço e tendência; `earn_date` evita buscar o calendário de novo"""
+        try:
+            precalc = self._precos.get(ticker_us)
+            conhecido = earn_date
+            earn_date, (ex_div, div_yield), (hist, erro) = self._paralelo(
+                (lambda: self._yahoo_calendario(ticker_us)) if conhecido is _PENDENTE else (lambda: conhecido),
+                lambda: self._yahoo_info(ticker_us),
+                lambda: (None, None) if precalc else self._yahoo_historico(ticker_us),
+            )
+            if erro: return None
+            
+            if precalc:
+                price, trend = precalc['price'], precalc['trend']
+            else:
+                close = hist['Close'].to_frame(ticker_us) if not hist.empty else pd.DataFrame(columns=[ticker_us])
+                price, trend = self.calcular_precos(close).loc[ticker_us, ['price', 'trend']]
+            
+            return {'earnings': earn_date, 'ex_div': ex_div, 'yield': div_yield, 'trend': trend, 'price': price}
+        except Exception as e:
+            self.inst.falha('yahoo', e)
+            return None
+
+    def get_news(self, ticker_us, desde=None):
+        """Notícias dos últimos 3 dias (cache de 15 min). Com `desde` (datetime), só a
+        partir desse dia e sem cache: o modo vigia pede a janela curta a cada rodada."""
+        try:
+            hj = datetime.now().strftime('%Y-%m-%d')
+            inicio = (desde or datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d')
+            def buscar():
+                # ErroUpstream (status != 200) sobe pelo memo: falhas não vão para o cache
+                with self._slots['finnhub'], self.inst.span('finnhub.noticias'):
+                    noticias = self.provedor.noticias(ticker_us, inicio, hj)
+                if not noticias: self.inst.contar('finnhub.noticias', 'vazio')
+                return noticias
+            if desde: return buscar()
+            return self.cache.memo('noticias', f"{ticker_us}:{inicio}:{hj}", buscar)
+        except ErroUpstream as e:
+            self.inst.falha('finnhub.noticias', e)
+            log.warning("Notícias de %s indisponíveis: %s", ticker_us, e)
+            return []
+        except Exception as e:
+            self.inst.falha('finnhub.noticias', e)
+            return []
+
+    def relatorio_desempenho(self):
+        """Relatório da instrumentação + contadores do cache e do HTTP (para JSON/UI)"""
+        return {**self.inst.relatorio(), 'cache': self.cache.estatisticas(), 'http': self.http.estatisticas()}
+
+    def gerar_analise_compra(self, gatilho, score):
+        """Gera a explicação do porquê comprar"""
+        return gerar_analise_compra(gatilho, score)
+
+    def coletar_ativo(self, bdr, corte=None, agora=None, incremental=False):
+        """Busca os dados de um BDR e devolve (linha de ativos, linhas de notícias) para
+        o pontuar(), ou None se não há dados. Com `corte`, avalia em camadas: calendário e
+        notícias primeiro; se nem supondo a janela de dividendos o score chega no corte,
+        o info/histórico não são buscados e o ativo volta None. Com `incremental`, busca
+        só as notícias e reaproveita a coleta do scan anterior se elas não mudaram."""
+        with self.inst.span('coleta'):
+            noticias = _PENDENTE
+            if incremental:
+                ticker_us = self.converter_para_us(bdr)
+                if not ticker_us: return None
+                noticias = self.get_news(ticker_us)
+                coleta = self._coleta_anterior(bdr, ticker_us, noticias)
+                if coleta: return coleta
+            if corte is None or corte > SCORE_CORTE_NOTICIAS:  # acima disso o limite não vale
+                coleta = self._coletar_ativo(bdr, noticias)
+            else:
+                coleta = self._coletar_em_camadas(bdr, corte, agora or datetime.now(), noticias)
+            if incremental and coleta:
+                self.cache.gravar('estado', bdr, {'noticias': _ids_noticias(noticias), 'coleta': coleta})
+            return coleta
+
+    def _coleta_anterior(self, bdr, ticker_us, noticias):
+        """Coleta guardada no último scan, se as notícias são as mesmas (balanço e dividendos
+        valem pelo TTL de 'estado'), com preço/tendência do lote atual; senão None"""
+        achou, estado = self.cache.obter('estado', bdr)
+        if not achou or estado['noticias'] != _ids_noticias(noticias):
+            self.inst.contar('incremental', 'reavaliados')
+            return None
+        self.inst.contar('incremental', 'reaproveitados')
+        ativo, linhas = estado['coleta']
+        precalc = self._precos.get(ticker_us)
+        if precalc: ativo = ativo[:5] + (precalc['price'], precalc['trend'])
+        return ativo, linhas
+
+    def _coletar_ativo(self, bdr, noticias=_PENDENTE):
+        ticker_us = self.converter_para_us(bdr)
+        if not ticker_us: return None
+        
+        conhecidas = noticias
+        y_data, noticias = self._paralelo(
+            lambda: self.get_yahoo_data(ticker_us),
+            (lambda: self.get_news(ticker_us)) if conhecidas is _PENDENTE else (lambda: conhecidas),
+        )
+        if not y_data: return None
+
+        with self.inst.span('noticias.pontuar'):
+            return linha_ativo(bdr, ticker_us, y_data), linhas_noticias(bdr, noticias, self.sentimento)
+
+    def _coletar_em_camadas(self, bdr, corte, agora, noticias=_PENDENTE):
+        ticker_us = self.converter_para_us(bdr)
+        if not ticker_us: return None
+
+        conhecidas = noticias
+        earn_date, noticias = self._paralelo(
+            lambda: self._yahoo_calendario(ticker_us),
+            (lambda: self.get_news(ticker_us)) if conhecidas is _PENDENTE else (lambda: conhecidas),
+        )
+        with self.inst.span('noticias.pontuar'):
+            linhas = linhas_noticias(bdr, noticias, self.sentimento)
+        if score_maximo(earn_date, [l[2] for l in linhas], agora) < corte:
+            self.inst.contar('poda', 'descartados')
+            return None
+
+        y_data = self.get_yahoo_data(ticker_us, earn_date)
+        if not y_data: return None
+        return linha_ativo(bdr, ticker_us, y_data), linhas
+
+    def pontuar_coletas(self, coletas, agora=None, sinais=False):
+        """Pontua de uma vez as coletas (None é ignorado) contra um único instante"""
+        with self.inst.span('pontuacao'):
+            return pontuar_coletas(coletas, agora or datetime.now(), sinais)
+
+    def _arquivar(self, arquivo, df, agora, min_score):
+        """Anexa o frame do scan (com os sinais) ao ArquivoScans; falha aqui não derruba o scan.
+        Só scans podados em SCORE_MINIMO (ou sem poda) entram: com um corte maior os ativos
+        abaixo dele nem são coletados e o backtest leria as faixas de baixo como vazias."""
+        if not _arquivavel(min_score):
+            log.info("Scan com score mínimo %s não arquivado (o histórico só guarda scans completos)",
+                     _corte(min_score))
+            return
+        try:
+            with self.inst.span('arquivo'):
+                arquivo.anexar(df, agora)
+        except Exception:
+            log.exception("Falha ao arquivar o scan em %s", getattr(arquivo, 'pasta', arquivo))
+
+    def analisar_ativo(self, bdr, traduzir=True, agora=None, min_score=None):
+        agora = agora or datetime.now()
+        coleta = self.coletar_ativo(bdr, _corte(min_score), agora)
+        if not coleta: return None
+        with self.inst.span('pontuacao.ativo'):
+            resultado = pontuar_ativo(coleta, agora)
+        if not resultado: return None
+        # Tradução Final (no escanear() vai em lote no fim, fora do caminho de cada ativo)
+        if traduzir: self.traduzir_resultados([resultado])
+        return resultado
+
+    def _coletar_em_ordem_de_chegada(self, bdrs, paralelo=True, lote_precos=True, corte=None, agora=None,
+                                     incremental=False):
+        """Gera (índice, coleta) conforme cada ativo termina (coleta None se falhou ou foi podado)"""
+        self._precos = {}
+        if lote_precos: self.preparar_precos(bdrs)
+        if not paralelo:
+            for i, bdr in enumerate(bdrs):
+                try: coleta = self.coletar_ativo(bdr, corte, agora, incremental)
+                except Exception as e:
+                    self.inst.falha('coleta', e)
+                    coleta = None
+                yield i, coleta
+            return
+
+        io_workers = sum(v for k, v in self.limites.items() if k != 'ativos')
+        pool = ThreadPoolExecutor(self.limites['ativos'], thread_name_prefix='bdr-ativo')
+        io = ThreadPoolExecutor(io_workers, thread_name_prefix='bdr-io')
+        self._io = io
+        try:
+            futuros = {pool.submit(self.coletar_ativo, bdr, corte, agora, incremental): i for i, bdr in enumerate(bdrs)}
+            for fut in as_completed(futuros):
+                try: coleta = fut.result()
+                except Exception as e:
+                    self.inst.falha('coleta', e)
+                    coleta = None
+                yield futuros[fut], coleta
+        finally:
+            # se quem consome parar no meio, não espera os ativos que ainda nem começaram
+            pool.shutdown(wait=True, cancel_futures=True)
+            io.shutdown(wait=True)
+            self._io = None
+
+    def escanear_stream(self, bdrs, paralelo=True, lote_precos=True, agora=None, min_score=None,
+                        incremental=False, arquivo=None):
+        """Versão em streaming do escanear(): gera (feitos, total, bdr, resultado) assim que
+        cada ativo termina, já pontuado contra o mesmo `agora` (resultado None se não há
+        oportunidade). Manchetes saem sem tradução; use traduzir_resultados() depois.
+        Com `arquivo`, o scan inteiro é arquivado quando o gerador termina (se `min_score`
+        não passa de SCORE_MINIMO)."""
+        agora = agora or datetime.now()
+        total = len(bdrs)
+        coletas = []
+        andamento = self._coletar_em_ordem_de_chegada(bdrs, paralelo, lote_precos, _corte(min_score), agora,
+                                                      incremental)
+        for feitos, (i, coleta) in enumerate(andamento, 1):
+            resultado = None
+            if coleta:
+                coletas.append(coleta)
+                with self.inst.span('pontuacao.ativo'):  # sem frames: um pontuar() por ativo custava ~12ms
+                    resultado = pontuar_ativo(coleta, agora)
+            yield feitos, total, bdrs[i], resultado
+        if arquivo is not None and _arquivavel(min_score):
+            self._arquivar(arquivo, self.pontuar_coletas(coletas, agora, sinais=True), agora, min_score)
+
+    def escanear(self, bdrs, progresso=None, paralelo=True, lote_precos=True, traduzir=True, agora=None,
+                 min_score=None, incremental=False, arquivo=None):
+        """Analisa a lista de BDRs e devolve os resultados na mesma ordem de `bdrs`
+        (None onde não há oportunidade). `progresso(feitos, total, bdr)` é chamado na
+        thread atual conforme cada ativo termina. A pontuação roda vetorizada sobre
+        todos os ativos contra o mesmo `agora`; as traduções saem em lote no final.
+        Com `min_score`, ativos que não podem chegar lá são podados antes das coletas
+        caras (e da tradução): o resultado filtrado por `min_score` é o mesmo.
+        Com `incremental`, ativos cujas notícias não mudaram desde o último scan (guardado
+        no cache) reaproveitam a coleta anterior; o score é sempre recalculado no `agora`.
+        Com `arquivo` (ArquivoScans) e `min_score` até SCORE_MINIMO, o frame do scan + sinais
+        brutos vai para o histórico."""
+        agora = agora or datetime.now()
+        total = len(bdrs)
+        coletas = [None] * total
+        andamento = self._coletar_em_ordem_de_chegada(bdrs, paralelo, lote_precos, _corte(min_score), agora,
+                                                      incremental)
+        for feitos, (i, coleta) in enumerate(andamento, 1):
+            coletas[i] = coleta
+            if progresso: progresso(feitos, total, bdrs[i])
+
+        df = self.pontuar_coletas(coletas, agora, sinais=arquivo is not None)
+        if arquivo is not None:
+            self._arquivar(arquivo, df, agora, min_score)
+            df = df.drop(columns=COLUNAS_SINAIS)
+        por_bdr = {r['BDR']: r for r in df.to_dict('records')}
+        resultados = [por_bdr.get(bdr) if coletas[i] else None for i, bdr in enumerate(bdrs)]
+        if traduzir:
+            self.traduzir_resultados([r for r in resultados if r and r['Score'] >= (min_score or 0)])
+        return resultados
+
+
+def _arquivavel(min_score):
+    """Scan podado até SCORE_MINIMO (ou sem poda): completo o bastante para o histórico"""
+    corte = _corte(min_score)
+    return corte is None or corte <= SCORE_MINIMO
+
+
+def _corte(min_score):
+    """Score mínimo efetivo da poda (None = avaliação completa)"""
+    return None if min_score is None else max(SCORE_MINIMO, min_score)
+
+
+def _ids_noticias(noticias):
+    """Identidade das notícias que entram na pontuação (id_noticia de cada uma)"""
+    return tuple(id_noticia(n) for n in noticias[:MAX_NOTICIAS])
@@ -0,0 +1,73 @@
+"""Pontuação das notícias: busca de palavras-chave e sentimento memoizado por artigo.
+
+O TextBlob é de longe o passo mais caro do processo, então o sentimento de cada
+texto é calculado uma única vez e reaproveitado entre ativos (a mesma manchete
+aparece para AAPL, MSFT, NVDA...) e entre scans, via memória local + cache em disco.
+"""
+import threading
+from collections import OrderedDict
+
+from .cache import CacheNulo, chave_texto
+
+KEYWORD_MAP = {
+    'upgrade': 'Upgrade de Analista', 'buy': 'Recomendação de Compra',
+    'record': 'Recorde Histórico', 'growth': 'Crescimento',
+    'approval': 'Aprovação Regulatória', 'soar': 'Disparada', 'jump': 'Salto'
+}
+# (palavra, gatilho) na ordem de prioridade do gatilho, montado uma vez no import
+_KEYWORDS = tuple(KEYWORD_MAP.items())
+
+
+def palavras_chave(texto):
+    """Gatilhos das palavras-chave presentes no texto (já em minúsculas), na ordem do
+    KEYWORD_MAP. Substring simples, como antes ('buy' também casa 'buyback')."""
+    return [gatilho for palavra, gatilho in _KEYWORDS if palavra in texto]
+
+
+class MemoSentimento:
+    """Polaridade do TextBlob memoizada pelo hash do texto: LRU em memória na frente
+    do cache persistente (tipo 'sentimento', não expira)"""
+
+    def __init__(self, cache=None, max_itens=20_000):
+        self.cache = cache or CacheNulo()
+        self.max_itens = max_itens
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self.calculados = 0  # quantas vezes o TextBlob rodou de fato
+
+    def polaridade(self, texto):
+        chave = chave_texto(texto)
+        with self._lock:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+
+        def calcular():
+            from textblob import TextBlob  # ~150ms de import (nltk): só quando há texto novo
+            with self._lock: self.calculados += 1
+            return TextBlob(texto).sentiment.polarity
+        valor = self.cache.memo('sentimento', chave, calcular)
+
+        with self._lock:
+            self._memoria[chave] = valor
+            if len(self._memoria) > self.max_itens:
+                self._memoria.popitem(last=False)
+        return valor
+
+
+_MEMO_PADRAO = MemoSentimento()
+
+
+def id_noticia(n):
+    """Identidade de um artigo: id do Finnhub ou, sem ele, a URL"""
+    return n.get('id', n.get('url'))
+
+
+def pontuar_noticia(n, sentimento=None):
+    """Pontos e gatilho de uma notícia: +5 por palavra-chave presente se o sentimento
+    do texto for positivo. Sem palavra-chave o sentimento nem é calculado."""
+    texto = f"{n['headline']} {n['summary']}".lower()
+    achadas = palavras_chave(texto)
+    if not achadas or (sentimento or _MEMO_PADRAO).polaridade(texto) <= 0.1:
+        return 0, ""
+    return 5 * len(achadas), achadas[0]
@@ -0,0 +1,247 @@
+"""Pontuação vetorizada: calcula janelas, score, Ação e Gatilho de todos os ativos de uma vez.
+
+Entradas são dois frames colunares montados na coleta:
+- ativos: uma linha por BDR (BDR, US, earnings, ex_div, yield, price, trend)
+- noticias: uma linha por notícia (BDR, ordem, pontos, gatilho, headline, summary, source, url)
+Tudo é calculado contra um único instante `agora`, então o resultado é determinístico.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .noticias import pontuar_noticia
+
+MAX_NOTICIAS = 15
+SCORE_CORTE_NOTICIAS = 80  # para de somar notícias quando o score chega aqui
+SCORE_MINIMO = 20
+SCORE_COMPRAR = 60  # a partir daqui a Ação é COMPRAR AGORA
+
+MANCHETE_TECNICA = "Movimento técnico/fundamental detectado"
+RESUMO_TECNICO = "Nenhuma notícia específica recente, mas indicadores técnicos ou calendário apontam oportunidade."
+FONTE_TECNICA = "Análise Técnica"  # cartões sem notícia: texto já em PT-BR, não traduz
+
+COLUNAS_ATIVOS = ['BDR', 'US', 'earnings', 'ex_div', 'yield', 'price', 'trend']
+COLUNAS_NOTICIAS = ['BDR', 'ordem', 'pontos', 'gatilho', 'headline', 'summary', 'source', 'url']
+# sinais brutos por ativo (pontuar(..., sinais=True)), para o arquivo histórico/backtest
+COLUNAS_SINAIS = ['dias_balanco', 'dias_dividendo', 'noticias_positivas', 'pontos_noticias']
+
+
+def gerar_analise_compra(gatilho, score=None):
+    """Gera a explicação do porquê comprar"""
+    if "Balanço" in gatilho:
+        return "Alta volatilidade esperada. Oportunidade de captura de movimento forte pós-resultado."
+    elif "Data Com" in gatilho:
+        return "Entrada estratégica para garantir o recebimento de dividendos (Yield atraente)."
+    elif "Upgrade" in gatilho or "Buy" in gatilho:
+        return "Bancos e analistas revisaram a nota para cima, indicando fluxo comprador institucional."
+    elif "Record" in gatilho or "Growth" in gatilho:
+        return "Empresa reportando crescimento ou recordes, validando a tendência de alta."
+    elif "Approval" in gatilho:
+        return "Aprovação regulatória (ex: FDA) destrava valor fundamental na ação."
+    else:
+        return "Fluxo de notícias extremamente positivo sugere otimismo do mercado."
+
+
+def linha_ativo(bdr, ticker_us, y_data):
+    """Linha do frame de ativos (COLUNAS_ATIVOS) a partir do get_yahoo_data()"""
+    return (bdr, ticker_us, y_data['earnings'], y_data['ex_div'], y_data['yield'], y_data['price'], y_data['trend'])
+
+
+def linhas_noticias(bdr, noticias, sentimento=None):
+    """Linhas do frame de notícias de um ativo (só as primeiras MAX_NOTICIAS contam)"""
+    linhas = []
+    for ordem, n in enumerate(noticias[:MAX_NOTICIAS]):
+        pontos, gatilho = pontuar_noticia(n, sentimento)
+        linhas.append((bdr, ordem, pontos, gatilho, n['headline'], n['summary'],
+                       n.get('source', 'Finnhub'), n['url']))
+    return linhas
+
+
+def _sem_fuso(d):
+    """Data sem fuso (hora local mantida, como o replace(tzinfo=None)); NaT se não é data"""
+    if isinstance(d, datetime): return d.replace(tzinfo=None)
+    try: t = pd.Timestamp(d)
+    except (TypeError, ValueError): return pd.NaT
+    return t.tz_localize(None) if t.tzinfo is not None else t
+
+
+def _para_datetime(serie):
+    """Datas de balanço em datetime64 sem fuso. O fuso sai antes do parse, só dos valores
+    que têm um: com fusos misturados o pd.to_datetime(errors='coerce') vira NaT em
+    silêncio (pandas >= 2) em vez de levantar erro."""
+    if serie.dtype == object:
+        valores = serie.to_numpy()
+        ajustar = [i for i, d in enumerate(valores) if isinstance(d, str) or getattr(d, 'tzinfo', None) is not None]
+        if ajustar:
+            valores = valores.copy()
+            valores[ajustar] = [_sem_fuso(valores[i]) for i in ajustar]
+        serie = pd.Series(valores, index=serie.index, dtype=object)
+    datas = pd.to_datetime(serie, errors='coerce')
+    if getattr(datas.dt, 'tz', None) is not None:
+        datas = datas.dt.tz_localize(None)
+    return datas
+
+
+def _epoch_local(serie):
+    """Epochs (ex_div) em datetime64 na hora local sem fuso, como o datetime.fromtimestamp;
+    0/None/NaN viram NaT. O deslocamento vem do time.localtime de cada valor (o tzlocal do
+    dateutil no pandas resolve o horário de verão elemento a elemento, bem mais devagar)."""
+    epoch = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float, copy=True)
+    epoch[epoch == 0] = np.nan
+    ok = np.flatnonzero(np.isfinite(epoch))
+    epoch[ok] += [time.localtime(e).tm_gmtoff for e in epoch[ok]]
+    return pd.Series(pd.to_datetime(epoch, unit='s'), index=serie.index)
+
+
+def _numero(valor):
+    try: return float(valor)
+    except (TypeError, ValueError): return np.nan
+
+
+def _dias_ate(alvo, agora):
+    """_dias() de um valor só; None se `alvo` é NaT"""
+    return None if pd.isna(alvo) else int(np.floor((alvo - agora) / pd.Timedelta(days=1)))
+
+
+def _dias(alvo, agora):
+    """Dias inteiros (arredondados para baixo, como timedelta.days) até `alvo`"""
+    return np.floor((alvo - agora) / pd.Timedelta(days=1))
+
+
+def score_maximo(earnings, pontos_noticias, agora):
+    """Maior score que o ativo ainda pode atingir sabendo só o balanço e as notícias:
+    supõe a janela de dividendos (+30). Vale como limite para cortes até
+    SCORE_CORTE_NOTICIAS: somar base nunca derruba o score abaixo desse corte."""
+    dias_bal = _dias_ate(_sem_fuso(earnings), _ingenuo(agora))
+    total = (50 if dias_bal is not None and 0 <= dias_bal <= 15 else 0) + 30
+    for ordem, pontos in enumerate(pontos_noticias):
+        if ordem and total >= SCORE_CORTE_NOTICIAS: break
+        total += pontos
+    return total
+
+
+def _ingenuo(agora):
+    agora = pd.Timestamp(agora)
+    return agora.tz_localize(None) if agora.tzinfo else agora
+
+
+def pontuar_ativo(coleta, agora):
+    """pontuar() de um ativo só, em Python puro: o mesmo resultado (dict, ou None abaixo
+    de SCORE_MINIMO) sem montar frames. Para quem pontua um ativo por vez (streaming)."""
+    (bdr, ticker_us, earnings, ex_div, _, price, trend), linhas = coleta
+    agora = _ingenuo(agora)
+    dias_bal = _dias_ate(_sem_fuso(earnings), agora)
+    janela_bal = dias_bal is not None and 0 <= dias_bal <= 15
+    epoch = _numero(ex_div)
+    dias_div = None
+    if epoch and epoch == epoch:
+        dias_div = _dias_ate(pd.Timestamp(epoch + time.localtime(epoch).tm_gmtoff, unit='s'), agora)
+    janela_div = dias_div is not None and 0 <= dias_div <= 10
+    base = (50 if janela_bal else 0) + (30 if janela_div else 0)
+
+    pontos, topo = 0, None
+    for linha in sorted(linhas, key=lambda linha: linha[1]):
+        if linha[1] != 0 and base + pontos >= SCORE_CORTE_NOTICIAS: break
+        pontos += int(linha[2])
+        if topo is None and int(linha[2]) > 0: topo = linha
+    score = base + pontos
+    if score < SCORE_MINIMO: return None
+
+    gatilho = ("Balanço Próximo" if janela_bal else "Data Com (Dividendos)" if janela_div
+               else topo[3] if topo else "")
+    if topo: manchete, resumo, fonte, link = topo[4:]
+    else: manchete, resumo, fonte, link = MANCHETE_TECNICA, RESUMO_TECNICO, FONTE_TECNICA, ""
+    return {
+        "BDR": bdr, "US": ticker_us, "Preço": _numero(price), "Tendência": trend, "Score": min(score, 100),
+        "Ação": "COMPRAR AGORA 🔴" if score >= SCORE_COMPRAR else "MONITORAR 🟠" if score >= 40 else "OBSERVAR 🟡",
+        "Manchete": manchete, "Resumo": resumo, "Fonte": fonte, "Link": link,
+        "Análise": gerar_analise_compra(gatilho), "Gatilho": gatilho or "Fluxo Positivo",
+    }
+
+
+def pontuar(ativos, noticias, agora, sinais=False):
+    """Score de todos os ativos de uma vez. Devolve um frame com as colunas do resultado,
+    na ordem de `ativos`, só com quem atingiu SCORE_MINIMO. Com `sinais`, inclui também
+    as COLUNAS_SINAIS (dias até balanço/data com, notícias que pontuaram).
+    As notícias são ligadas ao ativo pela posição (inteiros), não pelo texto do BDR."""
+    agora = _ingenuo(agora)
+    ativos = ativos.reset_index(drop=True)
+    n = len(ativos)
+    if noticias is None or not len(noticias):
+        noticias = pd.DataFrame(columns=COLUNAS_NOTICIAS)
+
+    # 1. Earnings (50 pts)
+    dias_bal = _dias(_para_datetime(ativos['earnings']), agora).to_numpy()
+    janela_bal = (dias_bal >= 0) & (dias_bal <= 15)
+
+    # 2. Dividendos (30 pts) - ex_div vem em epoch, na hora local como o fromtimestamp
+    dias_div = _dias(_epoch_local(ativos['ex_div']), agora).to_numpy()
+    janela_div = (dias_div >= 0) & (dias_div <= 10)
+
+    base = np.where(janela_bal, 50, 0) + np.where(janela_div, 30, 0)
+
+    # 3. Notícias: soma em ordem até o score chegar no corte (a 1ª sempre entra)
+    pos = pd.Index(ativos['BDR']).get_indexer(noticias['BDR'])
+    ordem = noticias['ordem'].to_numpy(dtype=np.int64)
+    pontos = noticias['pontos'].to_numpy(dtype=np.int64)
+    linhas = np.lexsort((ordem, pos))
+    linhas = linhas[pos[linhas] >= 0]
+    pos, ordem, pontos = pos[linhas], ordem[linhas], pontos[linhas]
+    acumulado = np.cumsum(pontos) - pontos  # soma antes da notícia, no frame inteiro
+    inicio_grupo = np.r_[True, pos[1:] != pos[:-1]] if len(pos) else np.zeros(0, bool)
+    antes = acumulado - np.maximum.accumulate(np.where(inicio_grupo, acumulado, 0))
+    contada = (ordem == 0) | (base[pos] + antes < SCORE_CORTE_NOTICIAS)
+    pts_noticias = np.bincount(pos[contada], weights=pontos[contada], minlength=n).astype(np.int64)
+
+    # notícia do topo: a 1ª contada que pontuou, por ativo
+    candidatas = np.flatnonzero(contada & (pontos > 0))
+    primeiras = candidatas[np.r_[True, pos[candidatas][1:] != pos[candidatas][:-1]]] if len(candidatas) else candidatas
+    tem_noticia = np.zeros(n, bool)
+    tem_noticia[pos[primeiras]] = True
+
+    topo = noticias.iloc[linhas[primeiras]]  # só as linhas do topo saem do Arrow
+
+    def do_topo(coluna, padrao):
+        valores = np.full(n, padrao, dtype=object)
+        valores[pos[primeiras]] = topo[coluna].to_numpy(dtype=object)
+        return valores
+
+    score = base + pts_noticias
+    fica = score >= SCORE_MINIMO
+    gatilho = np.select([janela_bal, janela_div, tem_noticia],
+                        ["Balanço Próximo", "Data Com (Dividendos)", do_topo('gatilho', "")], default="")[fica]
+    analises = {g: gerar_analise_compra(g) for g in set(gatilho)}
+    score_fica = score[fica]
+
+    df = pd.DataFrame({
+        "BDR": ativos['BDR'].to_numpy()[fica],
+        "US": ativos['US'].to_numpy()[fica],
+        "Preço": pd.to_numeric(ativos['price'], errors='coerce').to_numpy(dtype=float)[fica],
+        "Tendência": ativos['trend'].to_numpy()[fica],
+        "Score": np.minimum(score_fica, 100),
+        "Ação": np.select([score_fica >= SCORE_COMPRAR, score_fica >= 40],
+                          ["COMPRAR AGORA 🔴", "MONITORAR 🟠"], "OBSERVAR 🟡"),
+        "Manchete": do_topo('headline', MANCHETE_TECNICA)[fica],
+        "Resumo": do_topo('summary', RESUMO_TECNICO)[fica],
+        "Fonte": do_topo('source', FONTE_TECNICA)[fica],
+        "Link": do_topo('url', "")[fica],
+        "Análise": [analises[g] for g in gatilho],
+        "Gatilho": np.where(gatilho == "", "Fluxo Positivo", gatilho),
+    }, index=np.flatnonzero(fica))
+    if sinais:
+        df['dias_balanco'] = dias_bal[fica]
+        df['dias_dividendo'] = dias_div[fica]
+        df['noticias_positivas'] = np.bincount(pos[contada & (pontos > 0)], minlength=n)[fica]
+        df['pontos_noticias'] = pts_noticias[fica]
+    return df
+
+
+def pontuar_coletas(coletas, agora, sinais=False):
+    """pontuar() sobre as coletas [(linha de ativos, linhas de notícias)] (None é ignorado).
+    Frames em dtype object: inferir colunas de texto (Arrow) custaria mais que a pontuação."""
+    coletas = [c for c in coletas if c]
+    ativos = pd.DataFrame([c[0] for c in coletas], columns=COLUNAS_ATIVOS, dtype=object)
+    noticias = pd.DataFrame([n for c in coletas for n in c[1]], columns=COLUNAS_NOTICIAS, dtype=object)
+    return pontuar(ativos, noticias, agora, sinais)
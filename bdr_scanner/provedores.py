@@ -0,0 +1,202 @@
+"""Provedores de dados do scanner: ao vivo, gravando em disco ou reproduzindo gravações.
+
+Toda chamada externa do SwingTradeMonitor passa por um provedor, então dá para
+gravar um scan real (`ProvedorGravador`) e depois repetir exatamente as mesmas
+respostas sem rede (`ProvedorReplay`), com latência injetada configurável. É a base
+dos benchmarks offline em benchmarks/.
+"""
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+
+from .atomico import gravar_atomico
+from .cache import chave_texto
+from .transporte import ErroUpstream
+from .universo import TAMANHO_PEDACO, ler_lista_brapi
+
+METODOS = ('lista_brapi', 'calendario', 'info', 'historico', 'historico_lote', 'historico_periodo', 'noticias', 'traducao')
+
+
+class ProvedorAoVivo:
+    """Chamadas reais: BRAPI e Finnhub pelo Transporte, Yahoo pelo yfinance, tradução pelo Google"""
+
+    def __init__(self, http, finnhub_key, brapi_token):
+        self.http = http
+        self.finnhub_key, self.brapi_token = finnhub_key, brapi_token
+        # Tradutor por thread: o GoogleTranslator guarda os parâmetros da requisição na instância
+        self._local = threading.local()
+
+    def lista_brapi(self):
+        """Só {stock, volume} dos BDRs, lidos em streaming (a lista completa é grande)"""
+        url = f"https://brapi.dev/api/quote/list?token={self.brapi_token}"
+        with self.http.get(url, timeout=10, stream=True) as r:
+            pares = ler_lista_brapi(r.iter_content(chunk_size=TAMANHO_PEDACO))
+            return {'stocks': [{'stock': stock, 'volume': volume} for stock, volume in pares]}
+
+    def calendario(self, ticker_us):
+        import yfinance as yf
+        return yf.Ticker(ticker_us).calendar
+
+    def info(self, ticker_us):
+        import yfinance as yf
+        return yf.Ticker(ticker_us).info
+
+    def historico(self, ticker_us):
+        import yfinance as yf
+        return yf.Ticker(ticker_us).history(period='1mo')
+
+    def historico_lote(self, tickers_us):
+        import yfinance as yf
+        return yf.download(tickers_us, period='1mo', auto_adjust=True, progress=False,
+                           group_by='column', threads=True)
+
+    def historico_periodo(self, tickers_us, inicio, fim=None):
+        """Diário de `inicio` a `fim` (AAAA-MM-DD; None = até hoje), para o backtest"""
+        import yfinance as yf
+        return yf.download(tickers_us, start=inicio, end=fim, auto_adjust=True, progress=False,
+                           group_by='column', threads=True)
+
+    def noticias(self, ticker_us, inicio, fim):
+        """Notícias da Finnhub; ErroUpstream se a resposta não for 200"""
+        url = (f'https://finnhub.io/api/v1/company-news?symbol={ticker_us}'
+               f'&from={inicio}&to={fim}&token={self.finnhub_key}')
+        r = self.http.get(url, timeout=5)
+        if r.status_code != 200:
+            raise ErroUpstream('finnhub.io', status=r.status_code)
+        return r.json()
+
+    def traduzir_lote(self, textos):
+        if not hasattr(self._local, 'translator'):
+            from deep_translator import GoogleTranslator
+            self._local.translator = GoogleTranslator(source='auto', target='pt')
+        return self._local.translator.translate_batch(textos)
+
+
+def _nome_arquivo(chave):
+    return re.sub(r'[^A-Za-z0-9._-]', '_', chave) + '.pkl'
+
+
+class _Gravacoes:
+    """Leitura/escrita das respostas em pasta/<método>/<chave>.pkl"""
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+
+    def caminho(self, metodo, chave):
+        return os.path.join(self.pasta, metodo, _nome_arquivo(chave))
+
+    def gravar(self, metodo, chave, valor):
+        def escrever(tmp):
+            with open(tmp, 'wb') as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        gravar_atomico(self.caminho(metodo, chave), escrever)
+
+    def ler(self, metodo, chave):
+        with open(self.caminho(metodo, chave), 'rb') as f:
+            return pickle.load(f)
+
+
+class ProvedorGravador:
+    """Repassa para outro provedor e grava cada resposta (erros não são gravados)"""
+
+    def __init__(self, base, pasta):
+        self.base = base
+        self.gravacoes = _Gravacoes(pasta)
+
+    def _passar(self, metodo, chave, func):
+        valor = func()
+        self.gravacoes.gravar(metodo, chave, valor)
+        return valor
+
+    def lista_brapi(self):
+        return self._passar('lista_brapi', 'quote_list', self.base.lista_brapi)
+
+    def calendario(self, ticker_us):
+        return self._passar('calendario', ticker_us, lambda: self.base.calendario(ticker_us))
+
+    def info(self, ticker_us):
+        return self._passar('info', ticker_us, lambda: self.base.info(ticker_us))
+
+    def historico(self, ticker_us):
+        return self._passar('historico', ticker_us, lambda: self.base.historico(ticker_us))
+
+    def historico_lote(self, tickers_us):
+        # um único lote por gravação: o replay recorta as colunas pedidas
+        return self._passar('historico_lote', 'ultimo', lambda: self.base.historico_lote(tickers_us))
+
+    def historico_periodo(self, tickers_us, inicio, fim=None):
+        return self._passar('historico_periodo', f"{inicio}_{fim}",
+                            lambda: self.base.historico_periodo(tickers_us, inicio, fim))
+
+    def noticias(self, ticker_us, inicio, fim):
+        return self._passar('noticias', ticker_us, lambda: self.base.noticias(ticker_us, inicio, fim))
+
+    def traduzir_lote(self, textos):
+        traducoes = self.base.traduzir_lote(textos)
+        for texto, traducao in zip(textos, traducoes):
+            self.gravacoes.gravar('traducao', chave_texto(texto), traducao)
+        return traducoes
+
+
+def _recortar(dados, tickers_us):
+    """Só as colunas dos tickers pedidos, como o yf.download devolveria"""
+    if 'Close' in getattr(dados, 'columns', ()) and hasattr(dados['Close'], 'columns'):
+        pedidos = [t for t in tickers_us if t in dados['Close'].columns]
+        dados = dados.loc[:, dados.columns.get_level_values(1).isin(pedidos)]
+    return dados
+
+
+class ProvedorReplay:
+    """Serve as respostas gravadas, sem rede. `latencia` em segundos: um número para
+    todos os métodos ou {método: segundos}. Chave sem gravação vira ErroUpstream
+    (como um upstream fora do ar)."""
+
+    def __init__(self, pasta, latencia=0.0):
+        self.gravacoes = _Gravacoes(pasta)
+        self.latencia = latencia if isinstance(latencia, dict) else {m: latencia for m in METODOS}
+        self.chamadas = Counter()  # chamadas servidas por método
+        self._lock = threading.Lock()
+
+    def _servir(self, metodo, chave):
+        with self._lock: self.chamadas[metodo] += 1
+        espera = self.latencia.get(metodo, 0)
+        if espera: time.sleep(espera)
+        try:
+            return self.gravacoes.ler(metodo, chave)
+        except FileNotFoundError as e:
+            raise ErroUpstream(f"replay:{metodo}", causa=e) from e
+
+    def lista_brapi(self):
+        return self._servir('lista_brapi', 'quote_list')
+
+    def calendario(self, ticker_us):
+        return self._servir('calendario', ticker_us)
+
+    def info(self, ticker_us):
+        return self._servir('info', ticker_us)
+
+    def historico(self, ticker_us):
+        return self._servir('historico', ticker_us)
+
+    def historico_lote(self, tickers_us):
+        return _recortar(self._servir('historico_lote', 'ultimo'), tickers_us)
+
+    def historico_periodo(self, tickers_us, inicio, fim=None):
+        return _recortar(self._servir('historico_periodo', f"{inicio}_{fim}"), tickers_us)
+
+    def noticias(self, ticker_us, inicio, fim):
+        return self._servir('noticias', ticker_us)
+
+    def traduzir_lote(self, textos):
+        with self._lock: self.chamadas['traducao'] += 1
+        espera = self.latencia.get('traducao', 0)
+        if espera: time.sleep(espera)
+        traducoes = []
+        for texto in textos:
+            try: traducoes.append(self.gravacoes.ler('traducao', chave_texto(texto)))
+            except FileNotFoundError: traducoes.append(texto)
+        return traducoes
@@ -0,0 +1,50 @@
+"""Gravação e leitura dos resultados do scanner (JSON, CSV ou Parquet pela extensão)."""
+import os
+
+import pandas as pd
+
+from .atomico import gravar_atomico
+
+COLUNAS = ['BDR', 'US', 'Preço', 'Tendência', 'Score', 'Ação', 'Manchete', 'Resumo',
+           'Fonte', 'Link', 'Análise', 'Gatilho']
+
+
+def resultados_para_df(resultados, min_score=0):
+    """Monta o DataFrame ordenado por Score a partir da saída do escanear()"""
+    linhas = [r for r in resultados if r and r['Score'] >= min_score]
+    df = pd.DataFrame(linhas, columns=COLUNAS)
+    return df.sort_values(['Score'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _formato(caminho):
+    ext = os.path.splitext(caminho)[1].lower()
+    if ext not in ('.json', '.csv', '.parquet'):
+        raise ValueError(f"Formato não suportado: {caminho} (use .json, .csv ou .parquet)")
+    return ext
+
+
+def salvar_resultados(df, caminho):
+    """Grava de forma atômica: escreve num temporário e renomeia por cima do destino,
+    assim quem lê (a UI) nunca pega um arquivo pela metade"""
+    ext = _formato(caminho)
+
+    def escrever(tmp):
+        if ext == '.json':
+            df.to_json(tmp, orient='records', force_ascii=False, indent=2)
+        elif ext == '.csv':
+            df.to_csv(tmp, index=False)
+        else:
+            df.to_parquet(tmp, index=False)
+
+    gravar_atomico(caminho, escrever)
+
+
+def carregar_resultados(caminho):
+    """Lê um arquivo do salvar_resultados(); sempre com as COLUNAS, mesmo vazio"""
+    ext = _formato(caminho)
+    if ext == '.json':
+        # um scan sem oportunidades é gravado como [] e voltaria sem nenhuma coluna
+        return pd.read_json(caminho, orient='records').reindex(columns=COLUNAS)
+    if ext == '.csv':
+        return pd.read_csv(caminho)
+    return pd.read_parquet(caminho)
@@ -0,0 +1,110 @@
+"""Mapeamento BDR <-> ticker americano.
+
+O mapa vem de um CSV (bdr,us) que acompanha o pacote, mais um CSV local opcional
+gerado a partir da lista da BRAPI (`python -m bdr_scanner mapa --atualizar`). As
+buscas são por dicionário nos dois sentidos; BDR sem mapeamento é registrado no log
+em vez de virar um ticker chutado (ex.: GOGL34 -> GOGL) que só gera chamadas inúteis.
+"""
+import csv
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+
+from .atomico import gravar_atomico
+from .config import MAPA_PATH
+
+log = logging.getLogger(__name__)
+
+MAPA_PACOTE = os.path.join(os.path.dirname(__file__), 'dados', 'mapa_bdr_us.csv')
+# Famílias de BDR na B3: 31/32/33 (nível II/III e ETFs), 34/35 (nível I), 39 (ETFs)
+PADRAO_BDR = re.compile(r'^([A-Z0-9]{4})(31|32|33|34|35|39)$')
+
+
+class MapaTickers:
+    """Índices BDR -> US, US -> BDR e raiz de 4 letras -> US (para outras famílias do
+    mesmo emissor, ex.: um XXXX35 quando só o XXXX34 está no arquivo)"""
+
+    def __init__(self, pares):
+        self.bdr_para_us = {}
+        self.us_para_bdr = {}
+        self.raiz_para_us = {}
+        for bdr, us in pares:
+            bdr, us = bdr.strip().upper(), us.strip().upper()
+            if not bdr or not us: continue
+            self.bdr_para_us[bdr] = us
+            self.us_para_bdr.setdefault(us, bdr)
+            casou = PADRAO_BDR.match(bdr)
+            if casou: self.raiz_para_us.setdefault(casou.group(1), us)
+        self._sem_mapa = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def carregar(cls, caminhos=None):
+        """Lê o CSV do pacote e o CSV local (se existir); linhas do local têm prioridade"""
+        caminhos = caminhos or [MAPA_PACOTE, MAPA_PATH]
+        chave = tuple((c, os.path.getmtime(c)) for c in caminhos if os.path.exists(c))
+        return _carregar_cacheado(chave)
+
+    def us(self, bdr):
+        """Ticker americano do BDR ou None (registrado no log uma vez por BDR)"""
+        bdr = bdr.replace('.SA', '').upper()
+        us = self.bdr_para_us.get(bdr)
+        if us: return us
+        casou = PADRAO_BDR.match(bdr)
+        us = self.raiz_para_us.get(casou.group(1)) if casou else None
+        if not us:
+            with self._lock:
+                if bdr not in self._sem_mapa:
+                    self._sem_mapa.add(bdr)
+                    log.warning("BDR sem mapeamento para ticker americano: %s", bdr)
+        return us
+
+    def bdr(self, us):
+        return self.us_para_bdr.get(us.upper())
+
+    def bdrs(self):
+        return list(self.bdr_para_us)
+
+    @property
+    def sem_mapa(self):
+        """BDRs pedidos que ficaram sem ticker americano"""
+        with self._lock:
+            return sorted(self._sem_mapa)
+
+    def atualizar_da_brapi(self, stocks):
+        """Cruza a lista da BRAPI com o mapa: BDRs de famílias já conhecidas viram linhas
+        explícitas. Devolve (novo MapaTickers, BDRs que continuam sem mapeamento)."""
+        pares = dict(self.bdr_para_us)
+        sem_mapa = []
+        for stock in stocks:
+            casou = PADRAO_BDR.match(stock.upper())
+            if not casou or stock in pares: continue
+            us = self.raiz_para_us.get(casou.group(1))
+            if us: pares[stock] = us
+            else: sem_mapa.append(stock)
+        return MapaTickers(pares.items()), sem_mapa
+
+    def salvar(self, caminho=MAPA_PATH):
+        def escrever(tmp):
+            with open(tmp, 'w', newline='', encoding='utf-8') as f:
+                escritor = csv.writer(f)
+                escritor.writerow(['bdr', 'us'])
+                escritor.writerows(sorted(self.bdr_para_us.items()))
+
+        gravar_atomico(caminho, escrever)
+
+
+def _ler_csv(caminho):
+    with open(caminho, newline='', encoding='utf-8') as f:
+        return [(linha['bdr'], linha['us']) for linha in csv.DictReader(f)]
+
+
+@lru_cache(maxsize=4)
+def _carregar_cacheado(chave):
+    # `chave` inclui o mtime de cada arquivo: editar o CSV invalida o índice em memória
+    pares = []
+    for caminho, _mtime in chave:
+        pares.extend(_ler_csv(caminho))
+    return MapaTickers(pares)
@@ -0,0 +1,128 @@
+"""Camada HTTP compartilhada: sessão com keep-alive, limite de taxa por host e retentativas.
+
+Uma única `requests.Session` reaproveita as conexões TCP+TLS com brapi.dev e
+finnhub.io; um balde de fichas por host segura o ritmo dentro do plano gratuito
+do Finnhub; 429/5xx são repetidos com espera exponencial + jitter (respeitando o
+Retry-After). Se mesmo assim falhar, sobe ErroUpstream em vez de parecer "sem dados".
+"""
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+# host -> (fichas por segundo, rajada máxima). Finnhub gratuito: 60 chamadas/min.
+LIMITES_HOST = {
+    'finnhub.io': (55 / 60, 5),
+}
+STATUS_RETENTATIVA = {429, 500, 502, 503, 504}
+
+
+class ErroUpstream(Exception):
+    """Upstream respondeu erro (ou não respondeu) mesmo depois das retentativas"""
+
+    def __init__(self, host, status=None, causa=None):
+        self.host, self.status, self.causa = host, status, causa
+        detalhe = f"HTTP {status}" if status else repr(causa)
+        super().__init__(f"{host}: {detalhe}")
+
+
+class BaldeFichas:
+    """Token bucket: `taxa` fichas por segundo, acumulando até `capacidade`"""
+
+    def __init__(self, taxa, capacidade, relogio=time.monotonic, dormir=time.sleep):
+        self.taxa, self.capacidade = taxa, capacidade
+        self._fichas = float(capacidade)
+        self._relogio, self._dormir = relogio, dormir
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+
+    def aguardar(self):
+        """Consome uma ficha, dormindo o necessário; devolve quanto tempo esperou"""
+        with self._lock:
+            agora = self._relogio()
+            self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._fichas -= 1
+            espera = -self._fichas / self.taxa if self._fichas < 0 else 0.0
+        if espera: self._dormir(espera)
+        return espera
+
+
+class Transporte:
+    def __init__(self, limites_host=None, tentativas=3, espera_base=0.5, espera_max=8.0, conexoes=16):
+        self.tentativas = tentativas
+        self.espera_base, self.espera_max = espera_base, espera_max
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+        self.sessao.mount('https://', adaptador)
+        self.sessao.mount('http://', adaptador)
+        self._baldes = {host: BaldeFichas(taxa, rajada)
+                        for host, (taxa, rajada) in {**LIMITES_HOST, **(limites_host or {})}.items()}
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: defaultdict(float))
+
+    def _contar(self, host, **valores):
+        with self._lock:
+            for chave, valor in valores.items():
+                self._stats[host][chave] += valor
+
+    def _espera(self, tentativa, resposta=None):
+        """Backoff exponencial com jitter total; Retry-After do servidor tem prioridade"""
+        retry_after = resposta.headers.get('Retry-After') if resposta is not None else None
+        if retry_after:
+            try: return min(float(retry_after), self.espera_max)
+            except ValueError: pass
+        return random.uniform(0, min(self.espera_max, self.espera_base * 2 ** tentativa))
+
+    def get(self, url, timeout=10, **kwargs):
+        """GET com limite de taxa e retentativas. Devolve a resposta (inclusive 4xx que não
+        sejam 429); sobe ErroUpstream se 429/5xx/erro de rede persistir."""
+        return self._requisitar('GET', url, timeout, **kwargs)
+
+    def post(self, url, timeout=10, **kwargs):
+        """POST com as mesmas regras do get() (webhooks de alerta)"""
+        return self._requisitar('POST', url, timeout, **kwargs)
+
+    def _requisitar(self, metodo, url, timeout, **kwargs):
+        host = urlsplit(url).hostname
+        balde = self._baldes.get(host)
+        for tentativa in range(self.tentativas + 1):
+            if balde: self._contar(host, espera_limite=balde.aguardar())
+            inicio = time.perf_counter()
+            try:
+                resposta = self.sessao.request(metodo, url, timeout=timeout, **kwargs)
+            except requests.RequestException as e:
+                self._contar(host, requisicoes=1, erros_rede=1, tempo=time.perf_counter() - inicio)
+                if tentativa == self.tentativas: raise ErroUpstream(host, causa=e) from e
+                time.sleep(self._espera(tentativa))
+                continue
+            self._contar(host, requisicoes=1, tempo=time.perf_counter() - inicio,
+                         **{f"http_{resposta.status_code}": 1})
+            if resposta.status_code not in STATUS_RETENTATIVA:
+                return resposta
+            if tentativa == self.tentativas:
+                raise ErroUpstream(host, status=resposta.status_code)
+            espera = self._espera(tentativa, resposta)
+            log.info("%s respondeu %d, nova tentativa em %.1fs", host, resposta.status_code, espera)
+            time.sleep(espera)
+
+    def estatisticas(self):
+        """Por host: requisições, tempo total/médio, esperas do limitador e contagem por status"""
+        with self._lock:
+            saida = {}
+            for host, valores in self._stats.items():
+                dados = dict(valores)
+                if dados.get('requisicoes'):
+                    dados['tempo_medio'] = dados.get('tempo', 0) / dados['requisicoes']
+                saida[host] = dados
+            return saida
+
+    def fechar(self):
+        self.sessao.close()
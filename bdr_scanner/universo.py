@@ -0,0 +1,69 @@
+"""Universo de BDRs da BRAPI: leitura em streaming do quote/list e top-N por volume.
+
+O quote/list traz milhares de ações com uma dúzia de campos cada; só `stock` e
+`volume` dos BDRs interessam. A resposta é lida em pedaços e decodificada um objeto
+de `stocks` por vez (json.JSONDecoder.raw_decode), então o documento inteiro nunca
+vira um dict nem um DataFrame.
+"""
+import codecs
+import heapq
+import json
+import math
+import re
+
+SUFIXO_BDR = re.compile(r'(?:31|32|33|34|35|39)$')
+TAMANHO_PEDACO = 64 * 1024
+
+_INICIO_STOCKS = re.compile(r'"stocks"\s*:\s*\[')
+_SEPARADOR = re.compile(r'[\s,]*')
+_DECODER = json.JSONDecoder()
+
+
+def _volume(valor):
+    """Volume como float (NaN se faltar ou não for número), como o pd.to_numeric(coerce)"""
+    try: return float(valor)
+    except (TypeError, ValueError): return math.nan
+
+
+def pares_bdr(stocks):
+    """(stock, volume) dos BDRs de uma lista de objetos do quote/list"""
+    return [(s['stock'], _volume(s.get('volume'))) for s in stocks
+            if isinstance(s.get('stock'), str) and SUFIXO_BDR.search(s['stock'])]
+
+
+def ler_lista_brapi(pedacos):
+    """Gera (stock, volume) dos BDRs lendo o JSON do quote/list em pedaços (bytes ou str)"""
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, dentro = '', 0, False
+    for pedaco in pedacos:
+        buffer = buffer[pos:] + (utf8.decode(pedaco) if isinstance(pedaco, bytes) else pedaco)
+        pos = 0
+        if not dentro:
+            inicio = _INICIO_STOCKS.search(buffer)
+            if not inicio:
+                pos = max(0, len(buffer) - 32)  # a chave pode estar cortada entre dois pedaços
+                continue
+            pos, dentro = inicio.end(), True
+        while True:
+            pos = _SEPARADOR.match(buffer, pos).end()
+            if pos >= len(buffer): break
+            if buffer[pos] == ']': return
+            try: obj, pos_fim = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError: break  # objeto incompleto: espera o próximo pedaço
+            pos = pos_fim
+            stock = obj.get('stock') if isinstance(obj, dict) else None
+            if isinstance(stock, str) and SUFIXO_BDR.search(stock):
+                yield stock, _volume(obj.get('volume'))
+    if dentro:
+        raise ValueError("quote/list truncado: a lista 'stocks' não terminou")
+
+
+def top_por_volume(pares, limite=None):
+    """Tickers dos `limite` maiores volumes (todos se None), maior primeiro, sem ordenar
+    a lista inteira; empates mantêm a ordem da BRAPI e volume NaN vai para o fim"""
+    chave = lambda par: par[1] if par[1] == par[1] else -math.inf
+    if limite is None:
+        escolhidos = sorted(pares, key=chave, reverse=True)
+    else:
+        escolhidos = heapq.nlargest(limite, pares, key=chave)
+    return [stock for stock, _ in escolhidos]
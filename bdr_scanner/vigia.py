@@ -0,0 +1,186 @@
+"""Modo vigia: acompanha as notícias dos BDRs num intervalo e alerta quem vira COMPRAR AGORA.
+
+Depois da coleta inicial, cada rodada pede à Finnhub só a janela a partir do dia do
+artigo mais novo já visto (não os 3 dias inteiros) e pontua só os artigos com id novo;
+os pontos dos demais ficam guardados. O score de todos é recalculado de uma vez
+(pontuar vetorizado, sem upstream), porque as janelas de balanço/dividendos andam com
+o relógio. Quem cruza SCORE_COMPRAR gera um alerta nos destinos (stdout, arquivo
+JSON Lines ou webhook); cair abaixo rearma o alerta.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from .noticias import id_noticia, pontuar_noticia
+from .pontuacao import MAX_NOTICIAS, SCORE_COMPRAR, linha_ativo
+
+log = logging.getLogger(__name__)
+
+JANELA_DIAS = 3  # mesma janela do get_news()
+
+
+def _quando(noticia):
+    """Instante do artigo (epoch da Finnhub) ou None"""
+    try: return datetime.fromtimestamp(noticia['datetime'])
+    except (KeyError, TypeError, ValueError, OSError): return None
+
+
+# --- DESTINOS DOS ALERTAS ---
+class DestinoStdout:
+    def enviar(self, alerta):
+        sys.stdout.write(json.dumps(alerta, ensure_ascii=False, default=str) + '\n')
+        sys.stdout.flush()
+
+
+class DestinoArquivo:
+    """Acrescenta cada alerta como uma linha JSON em `caminho`"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+    def enviar(self, alerta):
+        linha = json.dumps(alerta, ensure_ascii=False, default=str) + '\n'
+        with self._lock, open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write(linha)
+
+
+class DestinoWebhook:
+    """POST do alerta em JSON para `url` (Slack/Teams/um stub local), com as retentativas do Transporte"""
+
+    def __init__(self, url, http=None):
+        if http is None:
+            from .transporte import Transporte
+            http = Transporte()
+        self.url, self.http = url, http
+
+    def enviar(self, alerta):
+        resposta = self.http.post(self.url, timeout=5, data=json.dumps(alerta, ensure_ascii=False, default=str),
+                                  headers={'Content-Type': 'application/json'})
+        resposta.raise_for_status()
+
+
+# --- VIGIA ---
+class Vigia:
+    """Estado por BDR: linha de ativos da última coleta, artigos da janela (mais novo
+    primeiro), pontos por id de artigo e último score"""
+
+    def __init__(self, monitor, bdrs, destinos, limiar=SCORE_COMPRAR):
+        self.monitor = monitor
+        self.bdrs = list(bdrs)
+        self.destinos = list(destinos)
+        self.limiar = limiar
+        self.estado = {}
+        self._dia = None
+
+    def _coletar_base(self, bdr, agora):
+        """Linha de ativos + artigos dos últimos 3 dias de um BDR (None se não há dados)"""
+        ticker_us = self.monitor.converter_para_us(bdr)
+        if not ticker_us: return None
+        y_data = self.monitor.get_yahoo_data(ticker_us)
+        if not y_data: return None
+        ativo = linha_ativo(bdr, ticker_us, y_data)
+        anterior = self.estado.get(bdr)
+        if anterior:  # nova coleta do dia: mantém artigos e pontos já conhecidos
+            return {**anterior, 'ativo': ativo}
+        return {'ativo': ativo, 'artigos': [], 'pontos': {}, 'score': None,
+                'novos': self.monitor.get_news(ticker_us)}
+
+    def iniciar(self, agora=None):
+        """Coleta completa (Yahoo + 3 dias de notícias) e score inicial, sem alertas"""
+        agora = agora or datetime.now()
+        self._recoletar(agora)
+        for bdr, resultado in self._pontuar(agora).items():
+            self.estado[bdr]['score'] = resultado['Score'] if resultado else None
+        return self
+
+    def _recoletar(self, agora):
+        self.monitor.preparar_precos(self.bdrs)
+        with ThreadPoolExecutor(self.monitor.limites['ativos'], thread_name_prefix='bdr-vigia') as pool:
+            bases = list(pool.map(lambda b: self._coletar_base(b, agora), self.bdrs))
+        for bdr, base in zip(self.bdrs, bases):
+            if base is None: continue
+            novos = base.pop('novos', [])
+            self.estado[bdr] = base
+            self._incorporar(bdr, novos, agora)
+        self._dia = agora.date()
+
+    def _incorporar(self, bdr, noticias, agora):
+        """Junta artigos novos (id ainda não visto), pontua só eles e descarta os que saíram
+        da janela; devolve quantos eram novos"""
+        est = self.estado[bdr]
+        novos = list({id_noticia(n): n for n in noticias if id_noticia(n) not in est['pontos']}.values())
+        for n in novos:
+            est['pontos'][id_noticia(n)] = pontuar_noticia(n, self.monitor.sentimento)
+        corte = (agora - timedelta(days=JANELA_DIAS)).date()
+        artigos = [n for n in novos + est['artigos'] if (_quando(n) or agora).date() >= corte]
+        artigos.sort(key=lambda n: _quando(n) or agora, reverse=True)  # estável: empates mantêm a ordem
+        est['artigos'] = artigos
+        vivos = {id_noticia(n) for n in artigos}
+        est['pontos'] = {k: v for k, v in est['pontos'].items() if k in vivos}
+        return len(novos)
+
+    def _coleta(self, bdr):
+        """(linha de ativos, linhas de notícias) no formato do pontuar(), sem repontuar artigos"""
+        est = self.estado[bdr]
+        linhas = [(bdr, ordem, *est['pontos'][id_noticia(n)], n['headline'], n['summary'], n.get('source', 'Finnhub'),
+                   n['url']) for ordem, n in enumerate(est['artigos'][:MAX_NOTICIAS])]
+        return est['ativo'], linhas
+
+    def _pontuar(self, agora):
+        """{bdr: resultado ou None} de todos os BDRs acompanhados, numa chamada vetorizada"""
+        bdrs = list(self.estado)
+        por_bdr = {r['BDR']: r for r in
+                   self.monitor.pontuar_coletas([self._coleta(b) for b in bdrs], agora).to_dict('records')}
+        return {b: por_bdr.get(b) for b in bdrs}
+
+    def _buscar_novos(self, bdr, agora):
+        est = self.estado[bdr]
+        datas = [d for d in map(_quando, est['artigos']) if d]
+        desde = max(datas) if datas else agora - timedelta(days=JANELA_DIAS)
+        return self.monitor.get_news(est['ativo'][1], desde=desde)
+
+    def rodada(self, agora=None):
+        """Busca as notícias novas, reatualiza os scores e envia os alertas; devolve os alertas"""
+        agora = agora or datetime.now()
+        if agora.date() != self._dia:  # virou o dia: balanço/dividendos/preço de novo
+            self._recoletar(agora)
+        bdrs = list(self.estado)
+        with ThreadPoolExecutor(self.monitor.limites['finnhub'], thread_name_prefix='bdr-vigia') as pool:
+            respostas = list(pool.map(lambda b: self._buscar_novos(b, agora), bdrs))
+        novos = sum(self._incorporar(b, noticias, agora) for b, noticias in zip(bdrs, respostas))
+        self.monitor.inst.contar('vigia', 'artigos_novos', novos)
+
+        alertas = []
+        for bdr, resultado in self._pontuar(agora).items():
+            est = self.estado[bdr]
+            anterior, score = est['score'], resultado['Score'] if resultado else None
+            est['score'] = score
+            if score is not None and score >= self.limiar and (anterior is None or anterior < self.limiar):
+                alertas.append({'em': agora.isoformat(timespec='seconds'), 'Score_anterior': anterior,
+                                **{k: resultado[k] for k in ('BDR', 'US', 'Score', 'Ação', 'Gatilho',
+                                                             'Preço', 'Manchete', 'Link')}})
+        for alerta in alertas:
+            self._enviar(alerta)
+        log.info("Vigia: %d artigos novos, %d alertas", novos, len(alertas))
+        return alertas
+
+    def _enviar(self, alerta):
+        for destino in self.destinos:
+            try: destino.enviar(alerta)
+            except Exception as e:
+                self.monitor.inst.falha('alerta', e)
+                log.warning("Alerta de %s não entregue em %s: %s", alerta['BDR'], type(destino).__name__, e)
+
+    def rodar(self, intervalo, rodadas=None):
+        """Coleta inicial e depois uma rodada a cada `intervalo` segundos (para sempre se `rodadas` é None)"""
+        self.iniciar()
+        feitas = 0
+        while rodadas is None or feitas < rodadas:
+            time.sleep(intervalo)
+            self.rodada()
+            feitas += 1
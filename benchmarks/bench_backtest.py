@@ -0,0 +1,92 @@
+"""Benchmark do arquivo histórico + backtest: gera meses de scans sintéticos em Parquet
+particionado por dia e mede a leitura (só as colunas do backtest x tudo) e o backtest.
+
+    python benchmarks/bench_backtest.py                     # 120 dias x 8 scans x 60 ativos
+    python benchmarks/bench_backtest.py --dias 250 --scans-por-dia 16
+
+Preços sintéticos (passeio aleatório), sem rede: mede só leitura e cálculo.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bdr_scanner.arquivo import ArquivoScans  # noqa: E402
+from bdr_scanner.backtest import COLUNAS_BACKTEST, backtest  # noqa: E402
+
+GATILHOS = ["Balanço Próximo", "Data Com (Dividendos)", "Upgrade de Analista", "Crescimento", "Fluxo Positivo"]
+
+
+def gerar_arquivo(pasta, dias, scans_por_dia, ativos, seed=0):
+    """Grava `dias` x `scans_por_dia` scans sintéticos; devolve os tickers e o 1º dia"""
+    r = random.Random(seed)
+    tickers = [f"T{i:03d}" for i in range(ativos)]
+    arquivo = ArquivoScans(pasta)
+    inicio = pd.Timestamp('2026-01-02 10:00')
+    for d in range(dias):
+        for s in range(scans_por_dia):
+            agora = inicio + pd.Timedelta(days=d, minutes=30 * s)
+            linhas = r.sample(tickers, max(1, ativos // 3))
+            scores = [r.choice([20, 30, 40, 50, 60, 80, 100]) for _ in linhas]
+            acoes = ["COMPRAR AGORA 🔴" if x >= 60 else "MONITORAR 🟠" if x >= 40 else "OBSERVAR 🟡" for x in scores]
+            arquivo.anexar(pd.DataFrame({
+                'BDR': [t + '34' for t in linhas], 'US': linhas, 'Preço': [100.0] * len(linhas),
+                'Tendência': "Alta 📈", 'Score': scores, 'Ação': acoes,
+                'Manchete': "Analysts issue an upgrade after record quarterly growth " * 3,
+                'Resumo': "Shares soar as regulators grant approval for the new drug " * 6,
+                'Fonte': "Finnhub", 'Link': "https://example.com", 'Análise': "Fluxo de notícias positivo",
+                'Gatilho': [r.choice(GATILHOS) for _ in linhas],
+                'dias_balanco': np.nan, 'dias_dividendo': np.nan, 'noticias_positivas': 1, 'pontos_noticias': 20,
+            }), agora)
+    return tickers, inicio
+
+
+def gerar_precos(tickers, inicio, dias, seed=0):
+    rng = np.random.default_rng(seed)
+    datas = pd.bdate_range(inicio.normalize(), periods=dias + 30)
+    passos = rng.normal(0.0005, 0.02, size=(len(datas), len(tickers)))
+    return pd.DataFrame(100 * np.exp(np.cumsum(passos, axis=0)), index=datas, columns=tickers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dias', type=int, default=120)
+    parser.add_argument('--scans-por-dia', type=int, default=8)
+    parser.add_argument('--ativos', type=int, default=60)
+    parser.add_argument('--pasta', help="arquivo já gerado (padrão: temporário novo)")
+    args = parser.parse_args()
+
+    pasta = args.pasta or tempfile.mkdtemp(prefix='bdr-arquivo-')
+    inicio_geracao = time.perf_counter()
+    tickers, inicio = gerar_arquivo(pasta, args.dias, args.scans_por_dia, args.ativos)
+    geracao = time.perf_counter() - inicio_geracao
+    print(f"arquivo={pasta} ({args.dias * args.scans_por_dia} scans, {geracao:.1f}s p/ gerar)")
+    close = gerar_precos(tickers, inicio, args.dias)
+    arquivo = ArquivoScans(pasta)
+
+    t = time.perf_counter()
+    completo = arquivo.ler()
+    t_completo = time.perf_counter() - t
+    t = time.perf_counter()
+    scans = arquivo.ler(COLUNAS_BACKTEST)
+    t_colunas = time.perf_counter() - t
+    t = time.perf_counter()
+    resumo = backtest(scans, close)
+    t_backtest = time.perf_counter() - t
+
+    print(f"linhas={len(scans)} sinais={resumo['sinais']}")
+    print(f"leitura completa:      {t_completo:7.3f}s ({completo.memory_usage(deep=True).sum() / 2**20:.1f} MiB)")
+    print(f"leitura só colunas:    {t_colunas:7.3f}s ({scans.memory_usage(deep=True).sum() / 2**20:.1f} MiB)")
+    print(f"backtest (vetorizado): {t_backtest:7.3f}s")
+    print(resumo['por_faixa'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark do carregamento do universo da BRAPI (quote/list): leitura antiga
+(json inteiro -> DataFrame -> str.contains -> sort) x streaming + seleção parcial.
+Mede tempo e pico de memória (tracemalloc) sobre o mesmo payload em bytes.
+
+    python benchmarks/bench_brapi.py                       # payload sintético de 20k ações
+    python benchmarks/bench_brapi.py --acoes 100000 --limite 60
+    python benchmarks/bench_brapi.py --fixtures .cache/gravacao   # lista gravada (scan --gravar)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+
+from bdr_scanner.provedores import _Gravacoes  # noqa: E402
+from bdr_scanner.universo import TAMANHO_PEDACO, ler_lista_brapi, top_por_volume  # noqa: E402
+
+SETORES = ["Technology Services", "Finance", "Health Technology", "Retail Trade", "Energy Minerals"]
+
+
+def gerar_payload(n, seed=0):
+    """quote/list sintético com os campos da BRAPI; ~1 em 4 é BDR"""
+    r = random.Random(seed)
+    stocks = []
+    for i in range(n):
+        sufixo = r.choice(['34', '35', '39', '32']) if r.random() < 0.25 else r.choice(['3', '4', '11'])
+        stocks.append({
+            'stock': f"{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}{i % 100:02d}{sufixo}",
+            'name': f"Empresa {i} S.A.", 'close': round(r.uniform(1, 500), 2),
+            'change': round(r.uniform(-5, 5), 4), 'volume': r.choice([r.randrange(1, 10**8), None]),
+            'market_cap': r.randrange(10**6, 10**12), 'logo': f"https://icons.brapi.dev/icons/{i}.svg",
+            'sector': r.choice(SETORES), 'type': 'stock' if r.random() < 0.8 else 'bdr',
+        })
+    return json.dumps({'indexes': [{'stock': '^BVSP', 'name': 'IBOVESPA'}], 'stocks': stocks,
+                       'availableSectors': SETORES, 'availableStockTypes': ['stock', 'fund', 'bdr']}).encode()
+
+
+def antigo(payload, limite):
+    data = json.loads(payload).get('stocks', [])
+    df = pd.DataFrame(data)
+    df = df[df['stock'].str.contains(r'(?:31|32|33|34|35|39)$')]
+    df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
+    return df.sort_values('volume', ascending=False)['stock'].tolist()[:limite]
+
+
+def novo(payload, limite):
+    pedacos = (payload[i:i + TAMANHO_PEDACO] for i in range(0, len(payload), TAMANHO_PEDACO))
+    return top_por_volume(list(ler_lista_brapi(pedacos)), limite)
+
+
+def medir(func, payload, limite, repeticoes):
+    """(melhor tempo em s, pico em bytes, resultado)"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(payload, limite)
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    func(payload, limite)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(tempos), pico, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--acoes', type=int, default=20_000, help="tamanho do payload sintético")
+    parser.add_argument('--limite', type=int, default=60)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--fixtures', help="pasta gravada com scan --gravar (usa a lista gravada)")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        payload = json.dumps(_Gravacoes(args.fixtures).ler('lista_brapi', 'quote_list')).encode()
+    else:
+        payload = gerar_payload(args.acoes)
+
+    t_antigo, pico_antigo, ref = medir(antigo, payload, args.limite, args.repeticoes)
+    t_novo, pico_novo, res = medir(novo, payload, args.limite, args.repeticoes)
+    if res != ref:  # só empates de volume no corte podem mudar (o sort antigo não era estável)
+        print(f"aviso: top-N difere da leitura antiga em {len(set(res) ^ set(ref))} tickers")
+
+    print(f"payload={len(payload) / 2**20:.1f} MiB limite={args.limite}")
+    print(f"antigo (json+DataFrame+sort): {t_antigo * 1000:8.1f} ms  pico {pico_antigo / 2**20:7.1f} MiB")
+    print(f"novo (streaming+nlargest):    {t_novo * 1000:8.1f} ms  pico {pico_novo / 2**20:7.1f} MiB"
+          f"  ({t_antigo / t_novo:.1f}x tempo, {pico_antigo / pico_novo:.0f}x memória)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Orçamento de inicialização: tempo de import (processo novo, melhor de N) do que a
+página e a CLI carregam antes de qualquer scan, e quais dependências pesadas vazaram.
+
+    python benchmarks/bench_import.py                 # tabela
+    python benchmarks/bench_import.py --verificar     # sai com 1 se estourar o orçamento (CI)
+
+A página só deve puxar streamlit + pandas (para mostrar o snapshot); o motor
+(yfinance, textblob, deep_translator, requests) entra no primeiro scan.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PESADOS = ('yfinance', 'textblob', 'deep_translator', 'requests', 'pandas', 'bdr_scanner.monitor')
+
+# cenário -> (módulos importados, orçamento em ms, pesados permitidos)
+CENARIOS = {
+    'pacote': (['bdr_scanner'], 30, ()),
+    'cli': (['bdr_scanner.cli'], 60, ()),
+    'pagina': (['bdr_scanner.atualizador', 'bdr_scanner.cache', 'bdr_scanner.config',
+                'bdr_scanner.instrumentacao', 'bdr_scanner.saida'], 700, ('pandas',)),
+    'motor': (['bdr_scanner.monitor'], 1200, ('pandas', 'requests', 'bdr_scanner.monitor')),
+}
+
+_SONDA = """
+import json, sys, time
+inicio = time.perf_counter()
+for m in {modulos!r}: __import__(m)
+print(json.dumps({{'ms': (time.perf_counter() - inicio) * 1000,
+                   'pesados': [p for p in {pesados!r} if p in sys.modules]}}))
+"""
+
+
+def medir(modulos):
+    """Import num interpretador novo; devolve {'ms': ..., 'pesados': [...]}"""
+    codigo = _SONDA.format(modulos=modulos, pesados=PESADOS)
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticoes', type=int, default=5, help="processos por cenário (vale o melhor)")
+    parser.add_argument('--verificar', action='store_true', help="falha se algum cenário estourar o orçamento")
+    parser.add_argument('--json', metavar='ARQ', help="grava as medições em JSON")
+    args = parser.parse_args()
+
+    medicoes, estourou = [], False
+    print(f"{'cenário':<8} {'import (ms)':>12} {'orçamento':>10}  pesados carregados")
+    for nome, (modulos, orcamento, permitidos) in CENARIOS.items():
+        rodadas = [medir(modulos) for _ in range(args.repeticoes)]
+        melhor = min(rodadas, key=lambda r: r['ms'])
+        vazados = [p for p in melhor['pesados'] if p not in permitidos]
+        ok = melhor['ms'] <= orcamento and not vazados
+        estourou |= not ok
+        medicoes.append({'cenario': nome, 'ms': round(melhor['ms'], 1), 'orcamento_ms': orcamento,
+                         'pesados': melhor['pesados'], 'ok': ok})
+        print(f"{nome:<8} {melhor['ms']:>12.1f} {orcamento:>10}  {', '.join(melhor['pesados']) or '-'}"
+              + ("" if ok else f"  <-- ESTOUROU{' (' + ', '.join(vazados) + ')' if vazados else ''}"))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'medicoes': medicoes}, f, indent=2)
+    if args.verificar and estourou:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Micro-benchmark do custo por notícia: laço antigo (TextBlob por palavra-chave) x
+pontuar_noticia com sentimento memoizado (frio e quente).
+
+    python benchmarks/bench_noticias.py --artigos 300 --repeticoes 3
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from textblob import TextBlob  # noqa: E402
+
+from bdr_scanner.noticias import KEYWORD_MAP, MemoSentimento, pontuar_noticia  # noqa: E402
+
+FRASES = [
+    "Analysts issue an upgrade after record quarterly growth",
+    "Shares soar as regulators grant approval for the new drug",
+    "Stock jumps on strong buy rating from major bank",
+    "Company misses estimates and cuts guidance",
+    "Market closes flat ahead of the central bank decision",
+    "Investors buy the dip as revenue growth beats expectations",
+]
+
+
+def gerar_artigos(n, seed=0):
+    r = random.Random(seed)
+    return [{'id': i, 'headline': f"{r.choice(FRASES)} ({i % 50})", 'summary': " ".join(r.sample(FRASES, 3)),
+             'url': f"https://example.com/{i}"} for i in range(n)]
+
+
+def pontuar_antigo(n):
+    """Laço original do analisar_ativo: um TextBlob novo a cada palavra-chave encontrada"""
+    texto = f"{n['headline']} {n['summary']}".lower()
+    pontos, gatilho = 0, ""
+    for k, v in KEYWORD_MAP.items():
+        if k in texto:
+            if TextBlob(texto).sentiment.polarity > 0.1:
+                pontos += 5
+                gatilho = gatilho or v
+    return pontos, gatilho
+
+
+def medir(func, artigos):
+    inicio = time.perf_counter()
+    resultado = [func(a) for a in artigos]
+    return (time.perf_counter() - inicio) / len(artigos) * 1e6, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--artigos', type=int, default=300)
+    parser.add_argument('--repeticoes', type=int, default=3, help="scans simulados com os mesmos artigos")
+    args = parser.parse_args()
+
+    artigos = gerar_artigos(args.artigos)
+    TextBlob("aquecimento").sentiment  # carrega o léxico fora da medição
+
+    us_antigo, ref = medir(pontuar_antigo, artigos)
+    memo = MemoSentimento()
+    us_frio, novo = medir(lambda a: pontuar_noticia(a, memo), artigos)
+    assert novo == ref, "pontuação diverge do laço antigo"
+    us_quente = min(medir(lambda a: pontuar_noticia(a, memo), artigos)[0] for _ in range(args.repeticoes))
+
+    print(f"artigos={len(artigos)} sentimentos calculados={memo.calculados}")
+    print(f"antigo (TextBlob por palavra): {us_antigo:9.1f} µs/artigo")
+    print(f"novo, memo frio:               {us_frio:9.1f} µs/artigo ({us_antigo / us_frio:.1f}x)")
+    print(f"novo, memo quente:             {us_quente:9.1f} µs/artigo ({us_antigo / us_quente:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
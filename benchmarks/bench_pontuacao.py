@@ -0,0 +1,157 @@
+"""Pontuação vetorizada (pontuar sobre todos os ativos de uma vez) x laço escalar antigo do
+analisar_ativo, ativo por ativo, e o pontuar_ativo (o escalar do streaming). Confere o
+resultado e mede os três (sentimento já calculado em todos: mede só a regra, com a
+montagem dos frames do pontuar_coletas).
+
+    python benchmarks/bench_pontuacao.py                    # 800 ativos sorteados
+    python benchmarks/bench_pontuacao.py --ativos 2000 --seed 5
+
+Balanços com fusos misturados (America/New_York, UTC, sem fuso, date), dividendos em
+epoch e notícias com e sem palavra-chave, tudo contra o mesmo `agora`. Confere de novo só
+com os balanços com fuso: sem nenhum valor ingênuo o pandas não levanta erro e vira NaT.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+from textblob import TextBlob  # noqa: E402
+
+from bdr_scanner.noticias import KEYWORD_MAP, MemoSentimento  # noqa: E402
+from bdr_scanner.pontuacao import (FONTE_TECNICA, MANCHETE_TECNICA, RESUMO_TECNICO, gerar_analise_compra,  # noqa: E402
+                                   linhas_noticias, pontuar_ativo, pontuar_coletas)
+
+AGORA = datetime(2026, 10, 17, 12)
+FRASES = [
+    "Analysts issue an upgrade after record quarterly growth",
+    "Shares soar as regulators grant approval for the new drug",
+    "Stock jumps on strong buy rating from major bank",
+    "Company misses estimates and cuts guidance",
+    "Market closes flat ahead of the central bank decision",
+    "Investors buy the dip as revenue growth beats expectations",
+]
+
+
+def sortear_balanco(r):
+    dia = AGORA.replace(hour=9) + timedelta(days=r.randint(-5, 25), hours=r.randint(0, 10))
+    return r.choice([
+        None, dia, dia.date(), pd.Timestamp(dia).tz_localize('America/New_York'),
+        dia.replace(tzinfo=timezone.utc),
+    ])
+
+
+def gerar_ativos(n, seed=0):
+    """[(linha de ativos, notícias)] como sai do coletar_ativo, antes de pontuar"""
+    r = random.Random(seed)
+    ativos = []
+    for i in range(n):
+        ex_div = (AGORA + timedelta(days=r.randint(-3, 15), hours=r.randint(0, 23))).timestamp()
+        noticias = [{'headline': f"{r.choice(FRASES)} ({i})", 'summary': " ".join(r.sample(FRASES, 2)),
+                     'source': r.choice(['Reuters', 'Yahoo']), 'url': f"https://example.com/{i}/{j}"}
+                    for j in range(r.randint(0, 20))]
+        linha = (f"T{i:04d}34", f"T{i:04d}", sortear_balanco(r), r.choice([None, ex_div]),
+                 r.choice([None, 0.021]), round(r.uniform(1, 500), 2), r.choice(["Alta 📈", "Baixa 📉", "Lateral"]))
+        ativos.append((linha, noticias))
+    return ativos
+
+
+@lru_cache(maxsize=None)
+def polaridade(texto):
+    return TextBlob(texto).sentiment.polarity
+
+
+def pontuar_antigo(linha, noticias, agora):
+    """Laço do analisar_ativo original, com `agora` no lugar do datetime.now()"""
+    bdr, ticker_us, earnings, ex_div, div_yield, price, trend = linha
+    score, manchete_top, resumo_top, fonte_top, link_top, gatilho_principal = 0, "", "", "", "", ""
+    if earnings:
+        dias = (pd.to_datetime(earnings).replace(tzinfo=None) - agora).days
+        if 0 <= dias <= 15:
+            score += 50
+            gatilho_principal = "Balanço Próximo"
+    if ex_div:
+        dias = (datetime.fromtimestamp(ex_div) - agora).days
+        if 0 <= dias <= 10:
+            score += 30
+            if not gatilho_principal: gatilho_principal = "Data Com (Dividendos)"
+    for n in noticias[:15]:
+        texto = f"{n['headline']} {n['summary']}".lower()
+        for k, v in KEYWORD_MAP.items():
+            if k in texto and polaridade(texto) > 0.1:
+                score += 5
+                if not manchete_top:
+                    manchete_top, resumo_top = n['headline'], n['summary']
+                    fonte_top, link_top = n.get('source', 'Finnhub'), n['url']
+                    if not gatilho_principal: gatilho_principal = v
+        if score >= 80: break
+    if score < 20: return None
+    if not manchete_top:
+        manchete_top, resumo_top, fonte_top = MANCHETE_TECNICA, RESUMO_TECNICO, FONTE_TECNICA
+    return {
+        "BDR": bdr, "US": ticker_us, "Preço": price, "Tendência": trend, "Score": min(score, 100),
+        "Ação": "COMPRAR AGORA 🔴" if score >= 60 else "MONITORAR 🟠" if score >= 40 else "OBSERVAR 🟡",
+        "Manchete": manchete_top, "Resumo": resumo_top, "Fonte": fonte_top, "Link": link_top,
+        "Análise": gerar_analise_compra(gatilho_principal, score),
+        "Gatilho": gatilho_principal if gatilho_principal else "Fluxo Positivo",
+    }
+
+
+def melhor_tempo(func, repeticoes):
+    """(melhor tempo em ms, resultado)"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000, resultado
+
+
+def conferir(coletas, memo, repeticoes=1):
+    """(resultados, ms do laço antigo, do pontuar e do pontuar_ativo); AssertionError se divergem"""
+    t_antigo, ref = melhor_tempo(
+        lambda: [r for r in (pontuar_antigo(linha, noticias, AGORA) for linha, noticias in coletas) if r], repeticoes)
+    # as linhas de notícias (pontos por artigo) saem na coleta, fora da pontuação
+    linhas = [(linha, linhas_noticias(linha[0], noticias, memo)) for linha, noticias in coletas]
+    t_novo, df = melhor_tempo(lambda: pontuar_coletas(linhas, AGORA), repeticoes)
+    t_ativo, um_a_um = melhor_tempo(lambda: [r for r in (pontuar_ativo(c, AGORA) for c in linhas) if r], repeticoes)
+
+    novo = df[list(ref[0])].to_dict('records') if ref else []
+    assert len(novo) == len(ref), f"{len(novo)} resultados x {len(ref)} no laço antigo"
+    for a, b in zip(novo, ref):
+        assert a == b, f"diverge em {b['BDR']}: {a} x {b}"
+    assert um_a_um == df.to_dict('records'), "pontuar_ativo diverge do pontuar"
+    return len(ref), t_antigo, t_novo, t_ativo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ativos', type=int, default=800)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    coletas = gerar_ativos(args.ativos, args.seed)
+    memo = MemoSentimento()
+    for _, noticias in coletas:  # sentimento fora da medição, nos dois lados
+        for n in noticias: memo.polaridade(f"{n['headline']} {n['summary']}".lower())
+        for n in noticias: polaridade(f"{n['headline']} {n['summary']}".lower())
+
+    resultados, ms_antigo, ms_novo, ms_ativo = conferir(coletas, memo, args.repeticoes)
+    com_fuso = [c for c in coletas if getattr(c[0][2], 'tzinfo', None) is not None]
+    conferir(com_fuso, memo)
+
+    print(f"ativos={len(coletas)} resultados={resultados} "
+          f"(+{len(com_fuso)} só com fuso): vetorizado == laço antigo")
+    print(f"antigo (laço por ativo): {ms_antigo:8.1f} ms")
+    print(f"novo (pontuar):          {ms_novo:8.1f} ms ({ms_antigo / ms_novo:.1f}x)")
+    print(f"um a um (pontuar_ativo): {ms_ativo:8.1f} ms ({ms_antigo / ms_ativo:.1f}x; o do streaming)")
+
+
+if __name__ == '__main__':
+    main()
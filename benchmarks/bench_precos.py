@@ -0,0 +1,94 @@
+"""Preço/tendência em lote (carregar_precos sobre um provedor falso) x regra antiga por
+ticker (hist['Close'].iloc[-1] contra a média do mês). Confere o resultado e mede o cálculo.
+
+    python benchmarks/bench_precos.py                  # 200 tickers x 22 pregões
+    python benchmarks/bench_precos.py --tickers 800 --seed 3
+
+Sem rede: o historico_lote do provedor falso devolve um frame como o do
+yf.download(group_by='column'), com buracos, um ticker sem nenhuma linha e um com NaN
+no último pregão (dia em que só os outros negociaram).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bdr_scanner.cache import CacheNulo  # noqa: E402
+from bdr_scanner.monitor import SwingTradeMonitor  # noqa: E402
+
+
+def gerar_download(tickers, pregoes, seed=0):
+    """Frame largo como o do yf.download: colunas (campo, ticker)"""
+    rng = np.random.default_rng(seed)
+    datas = pd.bdate_range('2026-09-18', periods=pregoes)
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (pregoes, len(tickers))), axis=0)),
+                         index=datas, columns=tickers)
+    close = close.mask(rng.random(close.shape) < 0.05)  # pregões sem negócio
+    close[tickers[0]] = np.nan  # sem nenhuma linha
+    close.iloc[-1, 1] = np.nan  # NaN no fim
+    close.iloc[:, 2] = close.iloc[:, 2].iloc[0]  # constante: preço == média (empate -> Baixa)
+    return pd.concat({'Close': close, 'Open': close.shift(1)}, axis=1)
+
+
+class ProvedorLote:
+    """Só o historico_lote do provedor: devolve sempre o mesmo frame e anota os pedidos"""
+
+    def __init__(self, dados):
+        self.dados, self.chamadas = dados, []
+
+    def historico_lote(self, tickers_us):
+        self.chamadas.append(list(tickers_us))
+        return self.dados
+
+
+def regra_antiga(hist):
+    """get_yahoo_data original sobre o stock.history(period='1mo') de um ticker"""
+    trend, price = "Lateral", 0
+    if not hist.empty:
+        price = hist['Close'].iloc[-1]
+        sma20 = hist['Close'].mean()
+        trend = "Alta 📈" if price > sma20 else "Baixa 📉"
+    return price, trend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--pregoes', type=int, default=22)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    dados = gerar_download(tickers, args.pregoes, args.seed)
+
+    monitor = SwingTradeMonitor(cache=CacheNulo(), provedor=ProvedorLote(dados))
+    inicio = time.perf_counter()
+    novo = monitor.carregar_precos(tickers)
+    t_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    # o history() de um ticker só traz os pregões em que ele negociou
+    ref = {t: regra_antiga(dados['Close'][[t]].dropna().rename(columns={t: 'Close'})) for t in tickers}
+    t_antigo = time.perf_counter() - inicio
+
+    assert monitor.provedor.chamadas == [tickers], "carregar_precos deveria fazer um único download"
+    assert {t: (p['price'], p['trend']) for t, p in novo.items()} == ref, "preço/tendência divergem da regra antiga"
+    assert ref[tickers[0]] == (0, "Lateral") and ref[tickers[1]][0] == dados['Close'][tickers[1]].dropna().iloc[-1]
+
+    # um ticker só: o download pode devolver o Close como Series
+    monitor.provedor = ProvedorLote(dados.xs(tickers[3], axis=1, level=1))
+    unico = monitor.carregar_precos([tickers[3]])
+    assert (unico[tickers[3]]['price'], unico[tickers[3]]['trend']) == ref[tickers[3]], "caso de um ticker diverge"
+
+    print(f"tickers={len(tickers)} pregões={args.pregoes}: lote == regra antiga por ticker")
+    print(f"antigo (por ticker): {t_antigo * 1000:8.1f} ms")
+    print(f"lote (vetorizado):   {t_lote * 1000:8.1f} ms ({t_antigo / t_lote:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark offline do scan completo sobre fixtures gravadas (ProvedorReplay): tempo
+total, CPU por ticker e pico de memória para universos de 30, 60 e 800 BDRs.
+
+    python benchmarks/bench_scan.py                          # fixtures sintéticas em .cache/fixtures
+    python benchmarks/bench_scan.py --latencia-ms 50 --tamanhos 30 60
+    python -m bdr_scanner scan --limit 60 --gravar .cache/gravacao   # grava um scan real...
+    python benchmarks/bench_scan.py --fixtures .cache/gravacao       # ...e mede em cima dele
+
+Sem rede e sem cache: cada rodada usa um monitor novo, então sentimento e tradução
+saem frios, como no primeiro scan do dia.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bdr_scanner.cache import CacheNulo  # noqa: E402
+from bdr_scanner.monitor import SwingTradeMonitor  # noqa: E402
+from bdr_scanner.provedores import ProvedorReplay, _Gravacoes  # noqa: E402
+from bdr_scanner.tickers import MAPA_PACOTE, MapaTickers  # noqa: E402
+
+FRASES = [
+    "Analysts issue an upgrade after record quarterly growth",
+    "Shares soar as regulators grant approval for the new drug",
+    "Stock jumps on strong buy rating from major bank",
+    "Company misses estimates and cuts guidance",
+    "Market closes flat ahead of the central bank decision",
+    "Investors buy the dip as revenue growth beats expectations",
+    "Quarterly results due next week",
+    "Shares slide after lawsuit filed",
+    "CEO comments on supply chain at industry conference",
+]
+
+
+def gerar_fixtures(pasta, n, agora, seed=0):
+    """Grava em `pasta` um universo sintético de `n` BDRs no formato do ProvedorGravador,
+    mais o mapa BDR -> US (mapa.csv) e o instante de referência (meta.json)"""
+    r = random.Random(seed)
+    gravacoes = _Gravacoes(pasta)
+    pares = [(f"B{i:03d}34", f"U{i:03d}") for i in range(n)]
+    stocks = [{'stock': bdr, 'volume': r.randrange(1, 10**7)} for bdr, _ in pares]
+    stocks += [{'stock': f"UNIT{i}11", 'volume': r.randrange(1, 10**7)} for i in range(n // 4)]  # não-BDRs
+    gravacoes.gravar('lista_brapi', 'quote_list', {'stocks': stocks})
+
+    datas = pd.date_range(end=agora.date(), periods=21, freq='B')
+    close = pd.DataFrame(np.cumsum(np.random.default_rng(seed).normal(0, 1, (len(datas), n)), axis=0) + 100,
+                         index=datas, columns=[us for _, us in pares])
+    gravacoes.gravar('historico_lote', 'ultimo', pd.concat({'Close': close}, axis=1))
+
+    for i, (_, us) in enumerate(pares):
+        earnings = (agora + timedelta(days=r.randrange(-5, 40))).date() if r.random() < .5 else None
+        ex_div = (agora + timedelta(days=r.randrange(-5, 20))).timestamp() if r.random() < .4 else None
+        gravacoes.gravar('calendario', us, {'Earnings Date': [earnings]} if earnings else {})
+        gravacoes.gravar('info', us, {'exDividendDate': ex_div, 'dividendYield': r.random() / 20})
+        gravacoes.gravar('historico', us, close[[us]].rename(columns={us: 'Close'}))
+        gravacoes.gravar('noticias', us, [
+            {'id': i * 100 + j, 'headline': f"{us}: {r.choice(FRASES)}", 'summary': r.choice(FRASES),
+             'source': 'Sintético', 'url': f"https://example.com/{us}/{j}"}
+            for j in range(r.randrange(0, 12))])
+
+    with open(os.path.join(pasta, 'mapa.csv'), 'w', encoding='utf-8') as f:
+        f.write("bdr,us\n" + "".join(f"{b},{u}\n" for b, u in pares))
+    with open(os.path.join(pasta, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'agora': agora.isoformat(), 'tickers': n}, f)
+
+
+def carregar_meta(pasta):
+    """(mapa, agora) da pasta de fixtures; gravações reais usam o mapa do pacote e o agora atual"""
+    mapa_local = os.path.join(pasta, 'mapa.csv')
+    mapa = MapaTickers.carregar([MAPA_PACOTE, mapa_local] if os.path.exists(mapa_local) else [MAPA_PACOTE])
+    try:
+        with open(os.path.join(pasta, 'meta.json'), encoding='utf-8') as f:
+            agora = datetime.fromisoformat(json.load(f)['agora'])
+    except FileNotFoundError:
+        agora = datetime.now()
+    return mapa, agora
+
+
+def rodar(pasta, tamanho, latencia, agora, mapa, paralelo=True, memoria=False, min_score=None):
+    """Um scan completo; devolve (segundos, segundos de CPU, pico em bytes, nº de ativos,
+    chamadas aos upstreams, resultados)"""
+    provedor = ProvedorReplay(pasta, latencia)
+    monitor = SwingTradeMonitor(cache=CacheNulo(), mapa=mapa, provedor=provedor)
+    bdrs = monitor.obter_bdrs_brapi(tamanho)
+    provedor.chamadas.clear()
+    if memoria: tracemalloc.start()
+    inicio, cpu = time.perf_counter(), time.process_time()
+    resultados = monitor.escanear(bdrs, paralelo=paralelo, agora=agora, min_score=min_score)
+    duracao, cpu = time.perf_counter() - inicio, time.process_time() - cpu
+    pico = 0
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return duracao, cpu, pico, len(bdrs), sum(provedor.chamadas.values()), resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', help="pasta gravada com --gravar (padrão: gera sintéticas)")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[30, 60, 800])
+    parser.add_argument('--latencia-ms', type=float, default=0, help="latência injetada por chamada")
+    parser.add_argument('--repeticoes', type=int, default=3, help="rodadas por tamanho (vale a melhor)")
+    parser.add_argument('--serial', action='store_true')
+    parser.add_argument('--min-score', type=int, help="avaliação em camadas (poda) com este score mínimo")
+    parser.add_argument('--json', metavar='ARQ', help="grava as medições em JSON")
+    args = parser.parse_args()
+
+    pasta = args.fixtures
+    if not pasta:
+        pasta = os.path.join('.cache', 'fixtures', f"sinteticas_{max(args.tamanhos)}")
+        if not os.path.exists(os.path.join(pasta, 'meta.json')):
+            gerar_fixtures(pasta, max(args.tamanhos), datetime(2026, 1, 5, 12))
+    mapa, agora = carregar_meta(pasta)
+    latencia = args.latencia_ms / 1000
+
+    medicoes = []
+    print(f"fixtures={pasta} latência={args.latencia_ms:g}ms {'serial' if args.serial else 'paralelo'}"
+          f" poda={args.min_score if args.min_score is not None else 'não'}")
+    print(f"{'ativos':>7} {'total (s)':>10} {'CPU/ticker (ms)':>16} {'pico (MiB)':>11} {'chamadas':>9} "
+          f"{'oportunidades':>14}")
+    for tamanho in args.tamanhos:
+        rodadas = [rodar(pasta, tamanho, latencia, agora, mapa, not args.serial, min_score=args.min_score)
+                   for _ in range(args.repeticoes)]
+        duracao, cpu, _, n, chamadas, resultados = min(rodadas, key=lambda r: r[0])
+        # pico de memória numa rodada à parte: o tracemalloc atrasa bastante o scan
+        pico = rodar(pasta, tamanho, latencia, agora, mapa, not args.serial, True, args.min_score)[2]
+        oportunidades = sum(1 for r in resultados if r and r['Score'] >= (args.min_score or 0))
+        medicoes.append({'ativos': n, 'total_s': round(duracao, 4), 'cpu_por_ticker_ms': round(cpu / n * 1000, 3),
+                         'pico_mib': round(pico / 2**20, 2), 'chamadas': chamadas, 'oportunidades': oportunidades})
+        print(f"{n:>7} {duracao:>10.3f} {cpu / n * 1000:>16.3f} {pico / 2**20:>11.2f} {chamadas:>9} "
+              f"{oportunidades:>14}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'fixtures': pasta, 'latencia_ms': args.latencia_ms, 'min_score': args.min_score,
+                   'medicoes': medicoes}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()